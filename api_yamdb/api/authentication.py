@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import TTLCache
+
+# Поля пользователя, которых достаточно для проверки прав.
+SNAPSHOT_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+CACHE_KEY = 'jwt-user:{}'
+GENERATION_KEY = 'jwt-user:generation'
+
+cache_settings = getattr(settings, 'JWT_USER_CACHE', {})
+local_cache = TTLCache(
+    max_size=cache_settings.get('MAX_SIZE', 10000),
+    ttl=cache_settings.get('TTL', 60)
+)
+
+
+def get_shared_cache():
+    alias = cache_settings.get('SHARED_CACHE')
+    return caches[alias] if alias else None
+
+
+def shared_key(shared_cache, user_id):
+    generation = shared_cache.get(GENERATION_KEY, 0)
+    return f'jwt-user:{generation}:{user_id}'
+
+
+def invalidate_user(user_id):
+    local_cache.delete(CACHE_KEY.format(user_id))
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(shared_key(shared_cache, user_id))
+
+
+def clear_users():
+    local_cache.clear()
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        return
+    # Общий кэш может хранить чужие ключи: вместо clear() старые
+    # снимки отсекаются новым поколением и истекают по TTL.
+    shared_cache.add(GENERATION_KEY, 0, None)
+    try:
+        shared_cache.incr(GENERATION_KEY)
+    except ValueError:
+        shared_cache.set(GENERATION_KEY, 1, None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация, которая берёт пользователя из кэша
+    вместо запроса к БД на каждый вызов API."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        snapshot = self.get_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        user = self.build_user(snapshot)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    def get_snapshot(self, user_id):
+        key = CACHE_KEY.format(user_id)
+        snapshot = local_cache.get(key)
+        if snapshot is not None:
+            return snapshot
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            shared = shared_key(shared_cache, user_id)
+            snapshot = shared_cache.get(shared)
+        if snapshot is None:
+            snapshot = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*SNAPSHOT_FIELDS).first()
+            if snapshot is None:
+                return None
+            if shared_cache is not None:
+                shared_cache.set(shared, snapshot, local_cache.ttl)
+        local_cache.set(key, snapshot)
+        return snapshot
+
+    def build_user(self, snapshot):
+        # Остальные поля отложены: загрузятся из БД при обращении,
+        # а save() запишет только поля из снимка.
+        user_model = get_user_model()
+        data = dict(zip(SNAPSHOT_FIELDS, snapshot))
+        field_names = [
+            field.attname for field in user_model._meta.concrete_fields
+            if field.attname in data
+        ]
+        return user_model.from_db(
+            router.db_for_read(user_model),
+            field_names,
+            [data[name] for name in field_names]
+        )
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+RESPONSE_VERSION_KEY = 'api-response:{}:version'
+RESPONSE_NAMESPACES = ('genres', 'categories', 'titles')
+
+
+class TTLCache:
+    """Потокобезопасный LRU-кэш процесса с ограничением времени жизни."""
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def get_response_cache():
+    return caches[settings.API_RESPONSE_CACHE['CACHE']]
+
+
+def get_response_version(namespace):
+    return get_response_cache().get(RESPONSE_VERSION_KEY.format(namespace), 0)
+
+
+def invalidate_responses(*namespaces):
+    """Сбрасывает кэш ответов, увеличивая версию пространства имён."""
+    cache = get_response_cache()
+    for namespace in namespaces or RESPONSE_NAMESPACES:
+        key = RESPONSE_VERSION_KEY.format(namespace)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def invalidate_on_commit(*namespaces, using=None):
+    """
+    Сбрасывает кэш ответов после COMMIT текущей транзакции: иначе GET
+    между сбросом и фиксацией закэширует старый ответ под новой версией.
+    Вне транзакции сбрасывает сразу."""
+    transaction.on_commit(
+        lambda: invalidate_responses(*namespaces), using=using
+    )
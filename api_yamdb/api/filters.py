@@ -0,0 +1,39 @@
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+from composition.models import Titles
+
+
+# Больше любого символа Unicode: верхняя граница диапазона префикса.
+MAX_CHAR = '\U0010ffff'
+
+
+class PrefixFilter(filters.CharFilter):
+    """
+    Префикс как диапазон name >= v AND name < v + MAX_CHAR: такой запрос
+    идёт по индексу, а LIKE из startswith в SQLite регистронезависим и
+    индекс не использует. Сравнение регистрозависимое."""
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return qs.filter(**{
+            f'{self.field_name}__gte': value,
+            f'{self.field_name}__lt': value + MAX_CHAR,
+        })
+
+
+class TitlesFilter(filters.FilterSet):
+    """Фильтрация произведений по slug, названию и году."""
+
+    name = filters.CharFilter(lookup_expr='icontains')
+    name_start = PrefixFilter(field_name='name')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    genre = filters.CharFilter(field_name='genre__slug')
+    category = filters.CharFilter(field_name='category__slug')
+    author = filters.CharFilter(field_name='author__slug')
+
+    class Meta:
+        model = Titles
+        fields = ('name', 'year', 'genre', 'category', 'author')
@@ -0,0 +1,212 @@
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import ListSerializer
+
+logger = logging.getLogger('api.metrics')
+
+# Метрика -> описание для формата Prometheus.
+HISTOGRAMS = {
+    'api_request_duration_seconds': 'Время обработки запроса',
+    'api_db_queries': 'Число SQL-запросов на запрос',
+    'api_db_duration_seconds': 'Суммарное время SQL-запросов',
+    'api_serializer_duration_seconds': 'Время работы сериализаторов',
+    'api_response_size_bytes': 'Размер тела ответа',
+}
+BUCKETS = {
+    'api_request_duration_seconds': (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    'api_db_queries': (1, 2, 3, 5, 10, 20, 50, 100),
+    'api_db_duration_seconds': (
+        0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    'api_serializer_duration_seconds': (
+        0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    'api_response_size_bytes': (
+        256, 1024, 4096, 16384, 65536, 262144, 1048576),
+}
+
+_local = threading.local()
+
+
+class Histogram:
+    """Кумулятивная гистограмма в стиле Prometheus."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.requests = defaultdict(int)
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(BUCKETS[name])
+            histogram.observe(value)
+
+    def count_request(self, labels):
+        with self.lock:
+            self.requests[labels] += 1
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+            self.requests.clear()
+
+    def render(self):
+        """Текстовый формат экспозиции Prometheus."""
+        lines = [
+            '# HELP api_requests_total Число обработанных запросов',
+            '# TYPE api_requests_total counter',
+        ]
+        with self.lock:
+            for labels, value in sorted(self.requests.items()):
+                lines.append(f'api_requests_total{format_labels(labels)} '
+                             f'{value}')
+            for name, description in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for (metric, labels), histogram in sorted(
+                        self.histograms.items()):
+                    if metric != name:
+                        continue
+                    lines.extend(render_histogram(name, labels, histogram))
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(
+            key, str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for key, value in pairs
+    )
+    return '{' + body + '}'
+
+
+def render_histogram(name, labels, histogram):
+    cumulative = 0
+    bounds = [str(bound) for bound in histogram.buckets] + ['+Inf']
+    for bound, count in zip(bounds, histogram.counts):
+        cumulative += count
+        yield (f'{name}_bucket{format_labels(labels, [("le", bound)])} '
+               f'{cumulative}')
+    yield f'{name}_sum{format_labels(labels)} {histogram.sum}'
+    yield f'{name}_count{format_labels(labels)} {histogram.count}'
+
+
+registry = Registry()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса; используется как execute_wrapper."""
+
+    def __init__(self, slow_query_seconds):
+        self.slow_query_seconds = slow_query_seconds
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed >= self.slow_query_seconds:
+                logger.warning(
+                    'Медленный SQL-запрос (%.1f мс): %s',
+                    elapsed * 1000, sql
+                )
+
+
+def add_serializer_time(seconds):
+    """Время сериализации вне DRF-сериализаторов (api.values)."""
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is not None:
+        metrics.serializer_time += seconds
+
+
+class MetricsSerializerMixin:
+    """Учитывает время to_representation корневого сериализатора."""
+
+    def to_representation(self, instance):
+        metrics = getattr(_local, 'metrics', None)
+        parent = self.parent
+        if metrics is None or not (
+            parent is None
+            or (isinstance(parent, ListSerializer) and parent.parent is None)
+        ):
+            return super().to_representation(instance)
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """Собирает время, SQL и размер ответа по маршрутам и методам."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = settings.METRICS
+        if not config['ENABLED']:
+            return self.get_response(request)
+        metrics = RequestMetrics(config['SLOW_QUERY_MS'] / 1000)
+        _local.metrics = metrics
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Учитываем запросы ко всем БД, включая реплики.
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _local.metrics = None
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        labels = (
+            ('route', match.view_name if match else 'unresolved'),
+            ('method', request.method),
+        )
+        registry.count_request(labels + (('status', response.status_code),))
+        registry.observe('api_request_duration_seconds', labels, elapsed)
+        registry.observe('api_db_queries', labels, metrics.queries)
+        registry.observe('api_db_duration_seconds', labels, metrics.db_time)
+        registry.observe(
+            'api_serializer_duration_seconds', labels,
+            metrics.serializer_time
+        )
+        if not response.streaming:
+            registry.observe(
+                'api_response_size_bytes', labels, len(response.content)
+            )
+        return response
@@ -0,0 +1,279 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag, urlencode
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import (
+    PrimaryKeyRelatedField, SlugRelatedField
+)
+from rest_framework.response import Response
+
+from .cache import get_response_cache, get_response_version
+from .metrics import add_serializer_time
+from .replicas import current_replica
+from .values import get_plan
+
+
+def query_param_set(request, name):
+    """Множество значений параметра-списка через запятую: ?name=a,b."""
+    if request is None:
+        return set()
+    return {
+        part.strip()
+        for value in request.query_params.getlist(name)
+        for part in value.split(',')
+        if part.strip()
+    }
+
+
+def sparse_fields_requested(request):
+    return (
+        request is not None
+        and request.method in SAFE_METHODS
+        and bool(query_param_set(request, 'fields'))
+    )
+
+
+def prune_queryset(queryset, fields, columns=()):
+    """
+    Оставляет в queryset только колонки и связи, нужные полям
+    сериализатора: only() для колонок, select_related для объектов
+    по внешнему ключу и prefetch_related для списков."""
+    opts = queryset.model._meta
+    load = {opts.pk.name, *columns}
+    select = []
+    prefetch = []
+    for field in fields.values():
+        source = field.source
+        if source == '*':
+            # SerializerMethodField: имя поля совпадает с атрибутом модели.
+            source = field.field_name
+        try:
+            model_field = opts.get_field(source.split('.')[0])
+        except FieldDoesNotExist:
+            # Значение вычисляется не из модели - сужать небезопасно.
+            return queryset
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(model_field.name)
+            continue
+        if model_field.concrete:
+            load.add(model_field.name)
+        if model_field.is_relation and (
+            not isinstance(field, PrimaryKeyRelatedField)
+            or '.' in source
+        ):
+            select.append(model_field.name)
+            if isinstance(field, SlugRelatedField):
+                # Из связанной таблицы нужна одна колонка.
+                load.add(f'{model_field.name}__{field.slug_field}')
+    queryset = queryset.select_related(None).prefetch_related(None)
+    return queryset.select_related(*select).prefetch_related(
+        *prefetch
+    ).only(*load)
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Оставляет в ответе на чтение только поля из ?fields=a,b.
+    Поля из Meta.expandable_fields выводятся только по ?expand=."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        expand = query_param_set(request, 'expand')
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                self.fields.pop(name, None)
+        if not sparse_fields_requested(request):
+            return
+        allowed = query_param_set(request, 'fields') | expand
+        for name in list(self.fields):
+            if name not in allowed:
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Для ?fields= загружает из БД только то, что попадёт в ответ.
+
+    sparse_columns - колонки, нужные помимо полей (например, ключ
+    сортировки для курсорной пагинации)."""
+
+    sparse_columns = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not sparse_fields_requested(self.request):
+            return queryset
+        return prune_queryset(
+            queryset, self.get_serializer().fields, self.sparse_columns
+        )
+
+
+class ValuesReadMixin:
+    """
+    list/retrieve без ModelSerializer: строки .values() переводятся
+    в словари по плану из сериализатора (api.values), ответ тот же.
+    С ?fields= и ?expand= - обычный путь через сериализатор."""
+
+    def get_values_plan(self):
+        request = self.request
+        if (
+            request.method not in SAFE_METHODS
+            or query_param_set(request, 'fields')
+            or query_param_set(request, 'expand')
+        ):
+            return None
+        return get_plan(self.get_serializer_class())
+
+    def serialize_rows(self, plan, rows):
+        started = time.perf_counter()
+        try:
+            return plan.serialize(rows)
+        finally:
+            add_serializer_time(time.perf_counter() - started)
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        rows = plan.queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(self.serialize_rows(plan, rows))
+        return self.get_paginated_response(self.serialize_rows(plan, page))
+
+    def retrieve(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            plan.queryset(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        # check_object_permissions не вызывается: разрешения читают
+        # атрибуты модели, которых в строке .values() нет. План есть
+        # только у безопасных методов, а права на чтение у этих viewset-ов
+        # от объекта не зависят; viewset, которому нужна проверка объекта
+        # при чтении, не должен подключать ValuesReadMixin.
+        return Response(self.serialize_rows(plan, [row])[0])
+
+
+class CachedResponseMixin:
+    """
+    Кэширует отрендеренные ответы list/retrieve и отдаёт ETag.
+
+    Ключ - хост (в ответах абсолютные ссылки next/previous), путь,
+    нормализованные параметры запроса и формат ответа; сбрасывается
+    сигналами моделей через версию пространства имён. Ответ, прочитанный
+    с реплики, хранится REPLICA_TIMEOUT: реплика может отставать."""
+
+    cache_namespace = None
+    cached_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_response_cache_key(self, request):
+        if (
+            self.cache_namespace is None
+            or self.action not in self.cached_actions
+            or request.accepted_renderer.format == 'api'
+        ):
+            return None
+        params = urlencode(sorted(
+            (key, sorted(values))
+            for key, values in request.query_params.lists()
+        ), doseq=True)
+        raw = '|'.join((
+            request.accepted_media_type, request.get_host(), request.path,
+            params
+        ))
+        return 'api-response:{}:{}:{}'.format(
+            self.cache_namespace,
+            get_response_version(self.cache_namespace),
+            hashlib.md5(raw.encode()).hexdigest()
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        cache = get_response_cache()
+        cached = cache.get(key)
+        if cached is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            cached = (
+                quote_etag(hashlib.md5(response.content).hexdigest()),
+                response['Content-Type'],
+                response.content
+            )
+            config = settings.API_RESPONSE_CACHE
+            cache.set(key, cached, (
+                config['REPLICA_TIMEOUT'] if current_replica()
+                else config['TIMEOUT']
+            ))
+        else:
+            response = None
+        etag, content_type, content = cached
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        elif response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        return response
+
+
+class NestedParentMixin:
+    """
+    Вложенный маршрут без лишних запросов к родителю.
+
+    Список и детальные запросы фильтруются по child_lookups одним
+    запросом, проверяя всю цепочку URL; родитель (parent_lookups)
+    загружается, только когда нужен, и кэшируется на время запроса.
+    Пустой список проверяет родителя, чтобы вернуть 404."""
+
+    parent_model = None
+    # Поле родителя -> именованный параметр URL.
+    parent_lookups = {}
+    # Поле дочерней модели -> именованный параметр URL.
+    child_lookups = {}
+
+    def get_parent(self):
+        if getattr(self, '_parent', None) is None:
+            self._parent = get_object_or_404(
+                self.parent_model.objects.only(*self.parent_lookups),
+                **{
+                    field: self.kwargs[kwarg]
+                    for field, kwarg in self.parent_lookups.items()
+                }
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{
+            field: self.kwargs[kwarg]
+            for field, kwarg in self.child_lookups.items()
+        })
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_parent()
+        return page
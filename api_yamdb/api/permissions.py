@@ -39,8 +39,8 @@ class ReadOnlyOrAdmins(permissions.BasePermission):
 class ReadOnlyOrOwnerOrAllAdmins(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        return (request.user
-                and request.method in permissions.SAFE_METHODS)
+        return (request.method in permissions.SAFE_METHODS
+                or request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
         return (
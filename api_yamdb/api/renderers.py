@@ -0,0 +1,50 @@
+import datetime
+import decimal
+import uuid
+
+import msgpack
+from django.utils.encoding import force_str
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+def encode_default(value):
+    """Типы, которых нет в MessagePack, - как в JSONEncoder DRF."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, '__iter__') and not isinstance(value, (str, bytes)):
+        return list(value)
+    # Ленивые строки переводов в сообщениях об ошибках.
+    return force_str(value)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Компактный двоичный формат для межсервисных клиентов."""
+    media_type = MSGPACK_MEDIA_TYPE
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,120 @@
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.viewsets import ViewSetMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+STICKY_KEY = 'replica-sticky:{}'
+
+_local = threading.local()
+
+
+class ReplicaSelector:
+    """Выбор реплики: по кругу или с наименьшей средней задержкой."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.latency = {}
+
+    def choose(self, aliases):
+        if settings.READ_REPLICAS['STRATEGY'] == 'least_latency':
+            with self.lock:
+                return min(
+                    aliases, key=lambda alias: self.latency.get(alias, 0)
+                )
+        return aliases[next(self.counter) % len(aliases)]
+
+    def observe(self, alias, seconds):
+        # Экспоненциальное скользящее среднее времени запроса.
+        with self.lock:
+            previous = self.latency.get(alias)
+            self.latency[alias] = (
+                seconds if previous is None
+                else previous * 0.8 + seconds * 0.2
+            )
+
+
+selector = ReplicaSelector()
+
+
+def current_replica():
+    return getattr(_local, 'alias', None)
+
+
+def client_key(request):
+    """id пользователя из JWT без обращения к БД, иначе IP."""
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            token = auth.get_validated_token(raw_token)
+            return f'user:{token[api_settings.USER_ID_CLAIM]}'
+        except (InvalidToken, TokenError, KeyError):
+            pass
+    return f'ip:{request.META.get("REMOTE_ADDR")}'
+
+
+class ReplicaRouter:
+    """Чтение в рамках безопасного запроса к API идёт на реплику."""
+
+    def db_for_read(self, model, **hints):
+        return current_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaMiddleware:
+    """
+    Отправляет GET/HEAD/OPTIONS к вьюсетам api на реплики. После записи
+    клиент STICKY_SECONDS читает с основной БД, чтобы видеть свои данные."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _local.alias = None
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            alias, _local.alias = _local.alias, None
+        if alias is not None:
+            selector.observe(alias, time.perf_counter() - started)
+        elif (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and settings.READ_REPLICAS['ALIASES']
+        ):
+            cache.set(
+                STICKY_KEY.format(client_key(request)),
+                True,
+                settings.READ_REPLICAS['STICKY_SECONDS']
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        aliases = settings.READ_REPLICAS['ALIASES']
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            not aliases
+            or request.method not in SAFE_METHODS
+            or view_class is None
+            or not issubclass(view_class, ViewSetMixin)
+            or not view_class.__module__.startswith('api.')
+            or cache.get(STICKY_KEY.format(client_key(request)))
+        ):
+            return None
+        _local.alias = selector.choose(aliases)
+        return None
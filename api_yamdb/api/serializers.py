@@ -1,7 +1,5 @@
-from tkinter import CURRENT
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
-from django.db.models import Avg
 
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
@@ -10,15 +8,46 @@ from rest_framework.relations import SlugRelatedField
 
 import datetime as dt
 
+from django.conf import settings
+
 from reviews.models import User
 from composition.models import (
     Titles,
     Genres,
     Categories,
     Author,
-    GenreTitle
+    GenreTitle,
+    TitleStats
 )
 from reviews.models import (Reviews, Comment)
+from reviews import changes, export
+from reviews.search import KINDS
+
+from .cache import invalidate_on_commit
+from .metrics import MetricsSerializerMixin
+from .mixins import SparseFieldsSerializerMixin
+
+
+# Границы INTEGER в SQLite и bigint в других БД.
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+
+
+def resolve_genres(genres):
+    """Находит жанры по slug одним запросом, недостающие создаёт."""
+    genres = {genre['slug']: genre for genre in genres}
+    existing = dict(
+        Genres.objects.filter(slug__in=genres).values_list('slug', 'id')
+    )
+    missing = [slug for slug in genres if slug not in existing]
+    if missing:
+        Genres.objects.bulk_create(Genres(**genres[slug]) for slug in missing)
+        existing.update(
+            Genres.objects.filter(slug__in=missing).values_list('slug', 'id')
+        )
+        # bulk_create не вызывает сигналы жанров: журнал и кэш - здесь.
+        changes.record('genres', [existing[slug] for slug in missing])
+        invalidate_on_commit('genres', 'titles')
+    return [existing[slug] for slug in genres]
 
 
 class SignUpSerializer(serializers.ModelSerializer):
@@ -45,6 +74,68 @@ class SignUpSerializer(serializers.ModelSerializer):
         fields = ('username', 'email')
 
 
+class SearchQuerySerializer(serializers.Serializer):
+    """Параметры полнотекстового поиска."""
+    q = serializers.CharField(max_length=200)
+    type = serializers.MultipleChoiceField(
+        choices=list(KINDS),
+        required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """Параметры чтения журнала изменений."""
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+    kind = serializers.MultipleChoiceField(
+        choices=list(changes.KINDS),
+        required=False
+    )
+
+
+class TitleIdsQuerySerializer(serializers.Serializer):
+    """Пакетное чтение произведений: ?ids=1,2,3."""
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            # Порядок запроса сохраняется, повторы отбрасываются.
+            ids = list(dict.fromkeys(
+                int(part) for part in value.split(',') if part.strip()
+            ))
+        except ValueError:
+            raise serializers.ValidationError(
+                'Ожидаются целые id через запятую.'
+            )
+        if not ids:
+            raise serializers.ValidationError('Укажите хотя бы один id.')
+        if not all(MIN_ID <= pk <= MAX_ID for pk in ids):
+            # Иначе SQLite падает с OverflowError на больших числах.
+            raise serializers.ValidationError(
+                'id должен помещаться в 64-битное целое.'
+            )
+        max_size = settings.TITLES_BATCH_MAX_SIZE
+        if len(ids) > max_size:
+            raise serializers.ValidationError(
+                f'Не больше {max_size} id за запрос.'
+            )
+        return ids
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Параметры выгрузки каталога."""
+    output = serializers.ChoiceField(
+        choices=list(export.FORMATS), default='ndjson'
+    )
+    include = serializers.MultipleChoiceField(
+        choices=export.INCLUDES,
+        required=False
+    )
+    updated_since = serializers.DateTimeField(required=False)
+
+
 class TokenSerializer(serializers.ModelSerializer):
     username = serializers.CharField(required=True)
     confirmation_code = serializers.CharField(required=True)
@@ -54,7 +145,7 @@ class TokenSerializer(serializers.ModelSerializer):
         fields = ('username', 'confirmation_code')
 
 
-class UsersSerializer(serializers.ModelSerializer):
+class UsersSerializer(MetricsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -67,7 +158,7 @@ class UsersSerializer(serializers.ModelSerializer):
         )
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(MetricsSerializerMixin, serializers.ModelSerializer):
     """
     Для отображения, поиска и фильтрации
     произведений по информации об
@@ -84,7 +175,7 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ('slug', 'titles',)
 
 
-class GenresSerializer(serializers.ModelSerializer):
+class GenresSerializer(MetricsSerializerMixin, serializers.ModelSerializer):
     """Жанры, описание."""
 
     class Meta:
@@ -92,7 +183,8 @@ class GenresSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class CategoriesSerializer(serializers.ModelSerializer):
+class CategoriesSerializer(
+        MetricsSerializerMixin, serializers.ModelSerializer):
     """Категории, описание."""
 
     class Meta:
@@ -100,7 +192,9 @@ class CategoriesSerializer(serializers.ModelSerializer):
         fields = ('slug', 'name')
 
 
-class TitlesSerializer(serializers.ModelSerializer):
+class TitlesSerializer(
+        SparseFieldsSerializerMixin, MetricsSerializerMixin,
+        serializers.ModelSerializer):
     """Основной метод получения информации."""
 
     category = serializers.SlugRelatedField(
@@ -123,7 +217,9 @@ class TitlesSerializer(serializers.ModelSerializer):
     rating = serializers.SerializerMethodField()
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'updated')
+        # Список отзывов тянет все их строки - только по ?expand=reviews.
+        expandable_fields = ('reviews',)
         model = Titles
         validators = [
             UniqueTogetherValidator(
@@ -139,9 +235,9 @@ class TitlesSerializer(serializers.ModelSerializer):
         return value
 
     def get_rating(self, obj):
-        rating = obj.reviews.all().aggregate(score=Avg('score'))
-        if rating['score']:
-            return round(rating['score'], 2)
+        # Рейтинг хранится в произведении и обновляется при записи отзывов.
+        if obj.rating:
+            return round(obj.rating, 2)
         return None
 
     def create(self, validated_data):
@@ -151,22 +247,35 @@ class TitlesSerializer(serializers.ModelSerializer):
             return title
         genres = validated_data.pop('genres')
         title = Titles.objects.create(**validated_data)
-        for genre in genres:
-            current_genre, status = Genres.objects.get_or_create(**genre)
-            GenreTitle.objects.create(genre=current_genre, title=title)
+        genre_ids = resolve_genres(genres)
+        GenreTitle.objects.bulk_create(
+            GenreTitle(genre_id=genre_id, title=title)
+            for genre_id in genre_ids
+        )
 
         return title
 
 
-class TitlesViewSerializer(serializers.ModelSerializer):
+class TitlesViewSerializer(
+        SparseFieldsSerializerMixin, MetricsSerializerMixin,
+        serializers.ModelSerializer):
     """Основной метод получения информации."""
 
     category = CategoriesSerializer(many=False, required=True)
     genre = GenresSerializer(many=True, required=False)
     rating = serializers.SerializerMethodField()
+    # Счётчик отзывов уже есть в произведении (rating_count).
+    reviews_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
+    score_histogram = serializers.SerializerMethodField()
 
     class Meta:
-        fields = ('id', 'name', 'year', 'rating', 'description', 'genre', 'category')
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category', 'reviews_count', 'score_histogram'
+        )
+        expandable_fields = ('reviews_count', 'score_histogram')
         model = Titles
         validators = [
             UniqueTogetherValidator(
@@ -182,11 +291,18 @@ class TitlesViewSerializer(serializers.ModelSerializer):
         return value
 
     def get_rating(self, obj):
-        rating = obj.reviews.all().aggregate(score=Avg('score'))
-        if rating['score']:
-            return round(rating['score'], 2)
+        # Рейтинг хранится в произведении и обновляется при записи отзывов.
+        if obj.rating:
+            return round(obj.rating, 2)
         return None
 
+    def get_score_histogram(self, obj):
+        try:
+            stats = obj.stats
+        except TitleStats.DoesNotExist:
+            stats = TitleStats(title=obj)
+        return stats.score_histogram
+
     def create(self, validated_data):
         """Определяем наличие жанров и прописываем."""
         if 'genres' not in self.initial_data:
@@ -194,37 +310,30 @@ class TitlesViewSerializer(serializers.ModelSerializer):
             return title
         genres = validated_data.pop('genres')
         title = Titles.objects.create(**validated_data)
-        for genre in genres:
-            current_genre, status = Genres.objects.get_or_create(**genre)
-            GenreTitle.objects.create(genre=current_genre, title=title)
+        genre_ids = resolve_genres(genres)
+        GenreTitle.objects.bulk_create(
+            GenreTitle(genre_id=genre_id, title=title)
+            for genre_id in genre_ids
+        )
 
         return title
         
         
-class ReviewsSerializer(serializers.ModelSerializer):
+class ReviewsSerializer(
+        SparseFieldsSerializerMixin, MetricsSerializerMixin,
+        serializers.ModelSerializer):
     """Ревью для произведений"""
     author = serializers.SlugRelatedField(
         slug_field='username',
         default=serializers.CurrentUserDefault(),
         read_only=True
     )
-    title = serializers.PrimaryKeyRelatedField(
-        many=False,
-        default=CURRENT,
-        queryset=Titles.objects.all()
-    )
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         fields = '__all__'
         model = Reviews
         lookup_field = 'slug'
-        read_only_fields = ['title']
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Reviews.objects.all(),
-                fields=('text', 'author', 'title')
-            )
-        ]
 
     def validate_score(self, value):
         if 0 >= value >= 10:
@@ -232,7 +341,9 @@ class ReviewsSerializer(serializers.ModelSerializer):
         return value
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(
+        SparseFieldsSerializerMixin, MetricsSerializerMixin,
+        serializers.ModelSerializer):
     """Комментарии на отзывы"""
     author = SlugRelatedField(slug_field='username', read_only=True)
 
@@ -247,3 +358,23 @@ class CommentsSerializer(serializers.ModelSerializer):
             )
             raise serializers.ValidationError(result)
         return data
+
+
+class TitleBulkItemSerializer(serializers.Serializer):
+    """Одно произведение в пакетной загрузке; ссылки - по slug."""
+    name = serializers.CharField()
+    year = serializers.IntegerField()
+    description = serializers.CharField(
+        max_length=3000, required=False, allow_null=True
+    )
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False, default=list
+    )
+    author = serializers.SlugField(required=False)
+
+    def validate_year(self, value):
+        current_year = dt.date.today().year
+        if value > current_year:
+            raise serializers.ValidationError('ПРоверьте год')
+        return value
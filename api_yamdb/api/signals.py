@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from composition.models import Categories, Genres, GenreTitle, Titles
+from reviews.models import Reviews
+
+from .authentication import clear_users, invalidate_user
+from .cache import invalidate_on_commit, invalidate_responses
+from .sqlite import check_connections, configure_connection
+from .throttling import reset_throttles
+
+# Какие кэши ответов устаревают при изменении модели.
+RESPONSE_DEPENDENCIES = {
+    Genres: ('genres', 'titles'),
+    Categories: ('categories', 'titles'),
+    Titles: ('titles',),
+    GenreTitle: ('titles',),
+    Reviews: ('titles',),
+}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, using=None, **kwargs):
+    # До COMMIT параллельный запрос успел бы закэшировать старую строку.
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id), using=using)
+
+
+@receiver(post_migrate)
+def database_reset(sender, **kwargs):
+    # flush и migrate меняют данные минуя сигналы моделей.
+    clear_users()
+    invalidate_responses()
+    reset_throttles()
+
+
+def catalogue_changed(sender, using=None, **kwargs):
+    invalidate_on_commit(*RESPONSE_DEPENDENCIES[sender], using=using)
+
+
+for model in RESPONSE_DEPENDENCIES:
+    post_save.connect(catalogue_changed, sender=model)
+    post_delete.connect(catalogue_changed, sender=model)
+
+connection_created.connect(configure_connection)
+request_started.connect(check_connections)
@@ -0,0 +1,45 @@
+import logging
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.sqlite')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Применяет PRAGMA из SQLITE_PRAGMAS к новому соединению SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def check_connections(**kwargs):
+    """
+    Аналог CONN_HEALTH_CHECKS: перед запросом закрывает постоянные
+    соединения, которые перестали отвечать."""
+    if not settings.DATABASE_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+
+
+def database_status():
+    """Проверяет каждую БД запросом SELECT 1."""
+    result = {}
+    for connection in connections.all():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+                status = {'ok': True}
+                if connection.vendor == 'sqlite':
+                    cursor.execute('PRAGMA journal_mode')
+                    status['journal_mode'] = cursor.fetchone()[0]
+        except Exception as error:
+            logger.exception('БД %s недоступна', connection.alias)
+            status = {'ok': False, 'error': str(error)}
+        result[connection.alias] = status
+    return result
@@ -0,0 +1,216 @@
+import hashlib
+import threading
+from abc import ABCMeta, abstractmethod
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+GENERATION_KEY = 'throttle:generation'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """'10/minute' -> (10, 60)."""
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period[0]]
+
+
+def sliding_window(previous, current, offset, limit, period):
+    """
+    Оценка скользящего окна по двум фиксированным: предыдущее окно
+    учитывается с весом непрошедшей доли текущего.
+    Возвращает (разрешено, сколько секунд ждать)."""
+    weight = 1 - offset / period
+    if previous * weight + current < limit:
+        return True, None
+    if previous and current < limit:
+        # Ждём, пока вес предыдущего окна не станет достаточно малым.
+        return False, (weight - (limit - current) / previous) * period
+    return False, period - offset
+
+
+class LocalWindowStore:
+    """Счётчики в памяти процесса - для одного узла."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _counts(self, key, index):
+        window, current, previous = self._windows.pop(key, (index, 0, 0))
+        if window != index:
+            previous = current if window == index - 1 else 0
+            current = 0
+        return current, previous
+
+    def check(self, key, limit, period):
+        """(разрешено, сколько ждать) без учёта запроса в счётчике."""
+        index, offset = divmod(time.time(), period)
+        with self._lock:
+            current, previous = self._counts(key, index)
+            self._windows[key] = (index, current, previous)
+        return sliding_window(previous, current, offset, limit, period)
+
+    def add(self, key, period):
+        index = time.time() // period
+        with self._lock:
+            current, previous = self._counts(key, index)
+            self._windows[key] = (index, current + 1, previous)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+
+    def hit(self, key, limit, period):
+        allowed, wait = self.check(key, limit, period)
+        if allowed:
+            self.add(key, period)
+        return allowed, wait
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+
+
+class CacheWindowStore:
+    """Счётчики в общем кэше Django - для нескольких узлов."""
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE['CACHE']]
+
+    def window_key(self, key, index):
+        digest = hashlib.md5(key.encode()).hexdigest()
+        generation = self.cache.get(GENERATION_KEY, 0)
+        return f'throttle:{generation}:{digest}:{int(index)}'
+
+    def check(self, key, limit, period):
+        """(разрешено, сколько ждать) без учёта запроса в счётчике."""
+        index, offset = divmod(time.time(), period)
+        current_key, previous_key = (
+            self.window_key(key, window) for window in (index, index - 1)
+        )
+        counts = self.cache.get_many([current_key, previous_key])
+        return sliding_window(
+            counts.get(previous_key, 0), counts.get(current_key, 0),
+            offset, limit, period
+        )
+
+    def add(self, key, period):
+        # Между check и add возможна гонка: лимит может быть превышен
+        # на число одновременных запросов, это допустимо.
+        current_key = self.window_key(key, time.time() // period)
+        self.cache.add(current_key, 0, period * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, period * 2)
+
+    def hit(self, key, limit, period):
+        allowed, wait = self.check(key, limit, period)
+        if allowed:
+            self.add(key, period)
+        return allowed, wait
+
+    def reset(self):
+        self.cache.add(GENERATION_KEY, 0, None)
+        try:
+            self.cache.incr(GENERATION_KEY)
+        except ValueError:
+            self.cache.set(GENERATION_KEY, 1, None)
+
+
+def get_store():
+    path = settings.THROTTLE['STORE']
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(path, import_string(path)())
+    return store
+
+
+def reset_throttles():
+    for store in list(_stores.values()):
+        store.reset()
+
+
+class WindowRateThrottle(BaseThrottle, metaclass=ABCMeta):
+    """
+    Проверяет запрос по нескольким счётчикам сразу.
+
+    get_idents возвращает пары (scope, идентификатор); лимит scope
+    берётся из settings.THROTTLE['RATES'], None отключает проверку.
+    Счётчики увеличиваются, только если запрос прошёл все проверки:
+    отказ по одному не расходует лимит остальных."""
+
+    @abstractmethod
+    def get_idents(self, request, view):
+        """Пары (scope, идентификатор) для запроса."""
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        rates = settings.THROTTLE['RATES']
+        store = get_store()
+        windows = {}
+        for scope, ident in self.get_idents(request, view):
+            rate = rates.get(scope)
+            if rate is None or not ident:
+                continue
+            windows[f'{scope}:{ident}'] = parse_rate(rate)
+        waits = [
+            wait for allowed, wait in (
+                store.check(key, limit, period)
+                for key, (limit, period) in windows.items()
+            )
+            if not allowed
+        ]
+        if waits:
+            self.wait_seconds = max(waits)
+            return False
+        for key, (_, period) in windows.items():
+            store.add(key, period)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+    def get_data(self, request, name):
+        data = request.data
+        value = data.get(name) if hasattr(data, 'get') else None
+        return str(value).strip().lower() if value else None
+
+
+class SignUpThrottle(WindowRateThrottle):
+    """Регистрация: по IP и по адресу и имени из запроса."""
+
+    def get_idents(self, request, view):
+        if request.method != 'POST':
+            return
+        yield 'signup_ip', self.get_ident(request)
+        yield 'signup_user', self.get_data(request, 'email')
+        yield 'signup_user', self.get_data(request, 'username')
+
+
+class TokenThrottle(WindowRateThrottle):
+    """Получение токена: по IP и по имени пользователя."""
+
+    def get_idents(self, request, view):
+        yield 'token_ip', self.get_ident(request)
+        yield 'token_user', self.get_data(request, 'username')
+
+
+class CreateThrottle(WindowRateThrottle):
+    """Создание отзывов и комментариев: по пользователю."""
+
+    def get_idents(self, request, view):
+        if request.method != 'POST':
+            return
+        if request.user and request.user.is_authenticated:
+            yield 'create', request.user.pk
+        else:
+            yield 'create', self.get_ident(request)
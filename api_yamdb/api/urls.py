@@ -10,7 +10,12 @@ from .views import (
     CategoriesViewSet,
     AuthorViewSet,
     ReviewViewSet,
-    CommentViewSet
+    CommentViewSet,
+    SearchView,
+    ChangesView,
+    ExportView,
+    MetricsView,
+    HealthView
 )
 
 router = DefaultRouter()
@@ -38,5 +43,10 @@ router.register('author', AuthorViewSet)
 
 urlpatterns = [
     path('v1/auth/token/', APIToken.as_view()),
+    path('v1/search/', SearchView.as_view(), name='search'),
+    path('v1/changes/', ChangesView.as_view(), name='changes'),
+    path('v1/export/titles/', ExportView.as_view(), name='export-titles'),
+    path('v1/metrics/', MetricsView.as_view(), name='metrics'),
+    path('v1/health/', HealthView.as_view(), name='health'),
     path('v1/', include(router.urls)),
 ]
@@ -0,0 +1,206 @@
+"""
+Быстрое чтение: ответ собирается из строк .values() по плану,
+скомпилированному один раз из сериализатора, без экземпляров моделей
+и обхода полей ModelSerializer на каждый объект.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import (
+    PrimaryKeyRelatedField, SlugRelatedField
+)
+
+# Поля, чей to_representation для значений из БД ничего не меняет.
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField)
+
+COLUMN, METHOD, NESTED, MANY = range(4)
+
+_plans = {}
+
+
+class UnsupportedField(Exception):
+    """Поле сериализатора нельзя вывести из строки .values()."""
+
+
+def passthrough(value):
+    return value
+
+
+class RowObject:
+    """Строка .values() с доступом к колонкам как к атрибутам."""
+    __slots__ = ('row', 'prefix')
+
+    def __init__(self, row, prefix):
+        self.row = row
+        self.prefix = prefix
+
+    def __getattr__(self, name):
+        try:
+            return self.row[self.prefix + name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class ValuesPlan:
+    """
+    План вывода сериализатора из строк .values().
+
+    Для каждого поля - колонка и to_representation того же поля DRF,
+    поэтому ответ совпадает с сериализатором байт в байт. Вложенный
+    сериализатор по внешнему ключу читается JOIN-ом в той же выборке,
+    many=True по ManyToMany - одним запросом на страницу.
+    SerializerMethodField получает строку, где доступны одноимённые
+    колонки модели."""
+
+    def __init__(self, serializer, prefix=''):
+        opts = serializer.Meta.model._meta
+        self.prefix = prefix
+        self.pk_column = prefix + opts.pk.attname
+        self.columns = [self.pk_column]
+        self.steps = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.steps.append(self.compile(opts, name, field))
+
+    def add_column(self, column):
+        column = self.prefix + column
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def compile(self, opts, name, field):
+        model_field = self.get_model_field(opts, name, field)
+        if isinstance(field, serializers.SerializerMethodField):
+            return self.compile_method(name, field, model_field)
+        if isinstance(field, serializers.ListSerializer):
+            return self.compile_many(name, field, model_field)
+        if model_field.many_to_many or model_field.one_to_many:
+            raise UnsupportedField(name)
+        if isinstance(field, serializers.BaseSerializer):
+            return self.compile_nested(name, field, model_field)
+        if isinstance(field, (SlugRelatedField, PrimaryKeyRelatedField)):
+            return self.compile_related(name, field, model_field)
+        return self.compile_column(name, field, model_field)
+
+    def get_model_field(self, opts, name, field):
+        source = field.source
+        if source == '*':
+            if not isinstance(field, serializers.SerializerMethodField):
+                raise UnsupportedField(name)
+            source = name
+        if '.' in source:
+            raise UnsupportedField(name)
+        try:
+            return opts.get_field(source)
+        except FieldDoesNotExist:
+            raise UnsupportedField(name)
+
+    def compile_method(self, name, field, model_field):
+        if not model_field.concrete or model_field.is_relation:
+            raise UnsupportedField(name)
+        self.add_column(model_field.attname)
+        method = getattr(field.parent, field.method_name)
+        return METHOD, name, method, self.prefix
+
+    def compile_many(self, name, field, model_field):
+        if not model_field.many_to_many or not model_field.concrete:
+            raise UnsupportedField(name)
+        child = ValuesPlan(field.child)
+        child.check_flat(name)
+        return MANY, name, (model_field, child)
+
+    def compile_nested(self, name, field, model_field):
+        if not model_field.many_to_one:
+            raise UnsupportedField(name)
+        null_column = self.add_column(model_field.attname)
+        child = ValuesPlan(field, f'{self.prefix}{model_field.name}__')
+        child.check_flat(name)
+        self.columns.extend(
+            column for column in child.columns
+            if column not in self.columns
+        )
+        return NESTED, name, null_column, child
+
+    def compile_related(self, name, field, model_field):
+        if isinstance(field, SlugRelatedField):
+            column = f'{model_field.name}__{field.slug_field}'
+        elif field.pk_field is None:
+            column = model_field.attname
+        else:
+            raise UnsupportedField(name)
+        return COLUMN, name, self.add_column(column), passthrough
+
+    def compile_column(self, name, field, model_field):
+        if model_field.is_relation:
+            raise UnsupportedField(name)
+        convert = field.to_representation
+        if type(field) in PASSTHROUGH_FIELDS:
+            convert = passthrough
+        return COLUMN, name, self.add_column(model_field.attname), convert
+
+    def check_flat(self, name):
+        # Списки грузятся на уровне страницы, внутри вложенных - нельзя.
+        if any(step[0] == MANY for step in self.steps):
+            raise UnsupportedField(name)
+
+    def queryset(self, queryset):
+        """Тот же queryset, но строками .values() с колонками плана."""
+        return queryset.select_related(None).prefetch_related(
+            None
+        ).values(*self.columns)
+
+    def serialize(self, rows):
+        """Список словарей для страницы строк, как serializer.data."""
+        rows = list(rows)
+        related = {
+            step[1]: self.load_many(step[2], rows)
+            for step in self.steps if step[0] == MANY
+        }
+        return [self.build(row, related) for row in rows]
+
+    def load_many(self, plan, rows):
+        """Значения ManyToMany для всей страницы одним запросом."""
+        model_field, child = plan
+        result = {row[self.pk_column]: [] for row in rows}
+        if not result:
+            return result
+        query_name = model_field.related_query_name()
+        related_rows = model_field.related_model._default_manager.filter(
+            **{f'{query_name}__in': list(result)}
+        ).values(query_name, *child.columns)
+        for row in related_rows:
+            result[row[query_name]].append(child.build(row))
+        return result
+
+    def build(self, row, related=None):
+        data = {}
+        for step in self.steps:
+            kind, name = step[0], step[1]
+            if kind == COLUMN:
+                value = row[step[2]]
+                data[name] = None if value is None else step[3](value)
+            elif kind == METHOD:
+                data[name] = step[2](RowObject(row, step[3]))
+            elif kind == NESTED:
+                data[name] = (
+                    None if row[step[2]] is None else step[3].build(row)
+                )
+            else:
+                data[name] = related[name][row[self.pk_column]]
+        return data
+
+
+def get_plan(serializer_class):
+    """
+    План для сериализатора без параметров запроса; None, если его
+    поля нельзя вывести из .values()."""
+    try:
+        return _plans[serializer_class]
+    except KeyError:
+        pass
+    try:
+        plan = ValuesPlan(serializer_class())
+    except UnsupportedField:
+        plan = None
+    _plans[serializer_class] = plan
+    return plan
@@ -5,6 +5,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
 
 from .permissions import (
     ReadOnlyOrOwnerOrAllAdmins, OwnerOrAdmins
@@ -12,9 +13,19 @@ from .permissions import (
 from rest_framework import permissions
 from rest_framework.decorators import action
 from django.db import IntegrityError
-from django.core.exceptions import ValidationError
-
-from .paginator import CommentPagination
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from .filters import TitlesFilter
+from .metrics import registry
+from .sqlite import database_status
+from .cache import invalidate_on_commit
+from .mixins import (
+    CachedResponseMixin, NestedParentMixin, SparseFieldsMixin,
+    ValuesReadMixin, query_param_set
+)
+from .paginator import CommentPagination, FeedPagination
+from .throttling import CreateThrottle, SignUpThrottle, TokenThrottle
 
 from rest_framework.permissions import (
     IsAdminUser,
@@ -22,24 +33,32 @@ from rest_framework.permissions import (
     IsAuthenticatedOrReadOnly
 )
 from django_filters.rest_framework import DjangoFilterBackend
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.core.mail import send_mail
 
 from .permissions import (
     IsAdminOrReadOnly,
     ReadOnlyOrAdmins,
 )
 from .serializers import (
+    ChangesQuerySerializer,
+    ExportQuerySerializer,
+    SearchQuerySerializer,
     SignUpSerializer,
     TokenSerializer,
     UsersSerializer
 )
 
 from composition.models import Titles, Genres, Categories, Author
+from reviews import changes, export, search
+from reviews.bulk import bulk_create_titles
+from reviews.mail import enqueue_mail
 from reviews.models import Reviews, User, Comment
 from .serializers import (
     TitlesSerializer,
     TitlesViewSerializer,
+    TitleBulkItemSerializer,
+    TitleIdsQuerySerializer,
     AuthorSerializer,
     CategoriesSerializer,
     GenresSerializer,
@@ -52,6 +71,7 @@ class SignUp(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = SignUpSerializer
     permission_class = [AllowAny]
+    throttle_classes = [SignUpThrottle]
 
     # def get_queryset(self):
     #    user = get_object_or_404(User, username=self.request.user.username)
@@ -72,12 +92,12 @@ class SignUp(viewsets.ModelViewSet):
         email = serializer.validated_data['email']
         if email not in User.objects.all():
             serializer.save(confirmation_code=confirmation_code)
-        return send_mail(
+        # Письмо уходит из очереди, не задерживая ответ на запрос.
+        enqueue_mail(
             'Код подверждения',
             confirmation_code,
-            ['admin@email.com'],
-            [email],
-            fail_silently=False
+            'admin@email.com',
+            [email]
         )
 
 
@@ -85,6 +105,7 @@ class APIToken(APIView):
     queryset = User.objects.all()
     serializer_class = TokenSerializer
     permission_class = [AllowAny]
+    throttle_classes = [TokenThrottle]
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -144,21 +165,103 @@ class UsernameViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    queryset = Titles.objects.all()
+class TitlesViewSet(
+        CachedResponseMixin, ValuesReadMixin, SparseFieldsMixin,
+        viewsets.ModelViewSet):
+    cache_namespace = 'titles'
+    # Категория и жанры подгружаются заранее, рейтинг хранится в модели,
+    # поэтому число запросов не зависит от размера страницы.
+    queryset = Titles.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('id')
     serializer_class = TitlesSerializer
     permission_classes = [IsAdminOrReadOnly]
     pagination_class = LimitOffsetPagination
     filter_backends = (DjangoFilterBackend,)
-    filterset_fields = ('name', 'year', 'genre', 'category', 'author')
+    filterset_class = TitlesFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if 'score_histogram' in query_param_set(self.request, 'expand'):
+            queryset = queryset.select_related('stats')
+        return queryset
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return TitlesViewSerializer
         return TitlesSerializer
 
+    def list(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.cached_response(self.batch_list, request)
+        return super().list(request, *args, **kwargs)
+
+    def batch_list(self, request):
+        """
+        Произведения по списку id в порядке запроса: один IN-запрос
+        и подгрузка жанров вместо запроса на каждое произведение."""
+        params = TitleIdsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        ids = params.validated_data['ids']
+        titles = {
+            title.pk: title
+            for title in self.filter_queryset(
+                self.get_queryset()
+            ).filter(pk__in=ids)
+        }
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk_create(self, request):
+        """Пакетное создание; ошибки возвращаются по каждому элементу."""
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Ожидается список произведений.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_size = settings.TITLES_BULK_MAX_SIZE
+        if len(request.data) > max_size:
+            return Response(
+                {'detail': f'Не больше {max_size} произведений за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results = {}
+        valid = []
+        for index, item in enumerate(request.data):
+            serializer = TitleBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'errors': serializer.errors}
+        created_results, created = bulk_create_titles(valid)
+        results.update(created_results)
+        invalidate_on_commit('titles')
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(created) < len(request.data):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(
+            {
+                'created': len(created),
+                'results': [
+                    dict(index=index, **results[index])
+                    for index in sorted(results)
+                ],
+            },
+            status=response_status
+        )
+
 
-class CategoriesViewSet(viewsets.ModelViewSet):
+class CategoriesViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = 'categories'
     queryset = Categories.objects.all()
     serializer_class = CategoriesSerializer
     lookup_field = 'slug'
@@ -170,7 +273,8 @@ class CategoriesViewSet(viewsets.ModelViewSet):
     search_fields = ('name', 'slug')
 
 
-class GenresViewSet(viewsets.ModelViewSet):
+class GenresViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = 'genres'
     queryset = Genres.objects.all()
     serializer_class = GenresSerializer
     lookup_field = 'slug'
@@ -184,44 +288,152 @@ class AuthorViewSet(viewsets.ModelViewSet):
     serializer_class = AuthorSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+        NestedParentMixin, ValuesReadMixin, SparseFieldsMixin,
+        viewsets.ModelViewSet):
+    # Автор нужен только ради username: одна JOIN-выборка на страницу.
+    queryset = Reviews.objects.select_related('author').only(
+        'id', 'title', 'text', 'score', 'pub_date', 'author__username'
+    )
     serializer_class = ReviewsSerializer
-    pagination_class = CommentPagination
+    pagination_class = FeedPagination
+    # Ключ курсорной пагинации нужен даже без поля в ответе.
+    sparse_columns = ('pub_date',)
     permission_classes = (ReadOnlyOrOwnerOrAllAdmins,)
-
-    def get_queryset(self):
-        # title_id = self.kwargs.get('id')
-        title = get_object_or_404(Titles, id=self.kwargs.get('id'))
-        #new_queryset = Reviews.objects.filter(
-        #    title__pk=title_id
-        #).order_by('-id')
-        new_queryset = title.reviews.all()
-        return new_queryset
+    throttle_classes = (CreateThrottle,)
+    parent_model = Titles
+    parent_lookups = {'id': 'id'}
+    child_lookups = {'title_id': 'id'}
 
     def perform_create(self, serializer):
-        # title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Titles, id=self.kwargs.get('id'))
-        if serializer.is_valid():
-            if title.reviews.filter(author=self.request.user).exists():
-                return Response(serializer.error, status=status.HTTP_400_BAD_REQUEST)
-            serializer.save(author=self.request.user, title=title)
-        raise ValidationError(
-            'Reviews with this Title and Owner already exists.'
+        # Один запрос к произведению и один INSERT: повторный отзыв
+        # отсекает ограничение unique_followers в БД.
+        try:
+            serializer.save(author=self.request.user, title=self.get_parent())
+        except IntegrityError:
+            raise ValidationError(
+                {'detail': 'Вы уже оставили отзыв на это произведение.'}
             )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+        NestedParentMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Comment.objects.select_related('author').only(
+        'id', 'review', 'text', 'pub_date', 'author__username'
+    )
     serializer_class = CommentsSerializer
-    pagination_class = CommentPagination
+    pagination_class = FeedPagination
+    sparse_columns = ('pub_date',)
     permission_classes = (ReadOnlyOrOwnerOrAllAdmins,)
-
-    def get_queryset(self):
-        # Получаем id title из эндпоинта
-        review = get_object_or_404(Reviews, id = self.kwargs.get('review_id'))
-        queryset = review.comments.all()
-        return queryset
+    throttle_classes = (CreateThrottle,)
+    parent_model = Reviews
+    parent_lookups = {'id': 'review_id', 'title_id': 'title_id'}
+    child_lookups = {'review_id': 'review_id', 'review__title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Reviews, id = self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
+
+
+class SearchView(APIView):
+    """Полнотекстовый поиск по произведениям, отзывам и комментариям."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if not search.is_available():
+            return Response(
+                {'detail': 'Поиск недоступен для этой базы данных.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        results = search.search(
+            params['q'],
+            kinds=params.get('type'),
+            limit=params['limit'] + 1,
+            offset=params['offset']
+        )
+        next_link = None
+        if len(results) > params['limit']:
+            results = results[:params['limit']]
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                'offset',
+                params['offset'] + params['limit']
+            )
+        return Response({'next': next_link, 'results': results})
 
+
+class ChangesView(APIView):
+    """Журнал изменений для инкрементальной синхронизации."""
+    permission_classes = (OwnerOrAdmins,)
+
+    def get(self, request):
+        serializer = ChangesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        results, has_more = changes.changes_since(
+            params['since'], params['limit'], params.get('kind')
+        )
+        return Response({
+            'next_since': results[-1]['seq'] if results else params['since'],
+            'has_more': has_more,
+            'results': results,
+        })
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка каталога для аналитики, только для админов."""
+    permission_classes = (OwnerOrAdmins,)
+
+    def get(self, request):
+        serializer = ExportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        output = params['output']
+        # Строки формируются по мере отправки: память не растёт с каталогом.
+        response = StreamingHttpResponse(
+            export.export_lines(
+                output,
+                updated_since=params.get('updated_since'),
+                include=params.get('include', ()),
+                chunk_size=settings.EXPORT_CHUNK_SIZE
+            ),
+            content_type=export.FORMATS[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{output}"'
+        )
+        return response
+
+
+class MetricsView(APIView):
+    """Метрики запросов в текстовом формате Prometheus, только для админов."""
+    permission_classes = (OwnerOrAdmins,)
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class HealthView(APIView):
+    """
+    Проверка доступности баз данных. Подробности (ошибки, journal_mode)
+    видят только админы, остальным - только ok/error."""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        databases = database_status()
+        healthy = all(db['ok'] for db in databases.values())
+        data = {'status': 'ok' if healthy else 'error'}
+        if OwnerOrAdmins().has_permission(request, self):
+            data['databases'] = databases
+        return Response(
+            data,
+            status=(
+                status.HTTP_200_OK if healthy
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        )
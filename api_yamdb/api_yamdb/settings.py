@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,6 +33,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,9 +72,44 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# PRAGMA для каждого нового соединения SQLite: WAL позволяет читать во время
+# записи, busy_timeout ждёт блокировку вместо ошибки database is locked.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 134217728,
+    'temp_store': 'MEMORY',
+}
+
+# Перед запросом закрывать постоянные соединения, которые не отвечают.
+DATABASE_HEALTH_CHECKS = True
+
+# Реплика для чтения, например копия db.sqlite3 для локальной проверки:
+# YAMDB_REPLICA_DB=/path/to/replica.sqlite3
+if os.environ.get('YAMDB_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['YAMDB_REPLICA_DB'],
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+# STRATEGY: round_robin или least_latency; STICKY_SECONDS - сколько
+# после записи клиент читает с основной БД.
+READ_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STRATEGY': 'round_robin',
+    'STICKY_SECONDS': 5,
+}
+
 
 # Password validation
 
@@ -116,15 +154,99 @@ AUTH_USER_MODEL = 'reviews.User'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Очередь писем: USE_THREAD - отправка фоновым потоком после коммита,
+# иначе очередь разбирает команда send_queued_mail; EAGER - сразу.
+MAIL_QUEUE = {
+    'EAGER': False,
+    'USE_THREAD': True,
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_DELAY': 60,
+    'LEASE': 300,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# MessagePack для межсервисных клиентов (Accept: application/msgpack),
+# если установлен пакет msgpack.
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'api.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append(
+        'api.renderers.MessagePackParser'
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кэш ответов публичных эндпоинтов (жанры, категории, произведения).
+# REPLICA_TIMEOUT - срок ответа, прочитанного с реплики: отставшая
+# реплика не должна надолго закэшировать старые данные.
+API_RESPONSE_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'REPLICA_TIMEOUT': 5,
+}
+
+# Ограничение частоты запросов (скользящее окно). STORE - где хранятся
+# счётчики: LocalWindowStore в памяти процесса (один узел) или
+# CacheWindowStore в кэше CACHE (общий для нескольких узлов).
+THROTTLE = {
+    'STORE': 'api.throttling.LocalWindowStore',
+    'CACHE': 'default',
+    'RATES': {
+        'signup_ip': '20/hour',
+        'signup_user': '5/hour',
+        'token_ip': '30/minute',
+        'token_user': '10/minute',
+        'create': '30/minute',
+    },
+}
+
+# Произведений в одной пачке потоковой выгрузки /api/v1/export/titles/.
+EXPORT_CHUNK_SIZE = 1000
+
+# Максимум id в одном запросе GET /api/v1/titles/?ids=.
+TITLES_BATCH_MAX_SIZE = 200
+
+# Максимум произведений в одном запросе POST /api/v1/titles/bulk/.
+TITLES_BULK_MAX_SIZE = 5000
+
+# Метрики запросов: гистограммы по маршрутам на /api/v1/metrics/
+# и логирование SQL-запросов медленнее SLOW_QUERY_MS.
+METRICS = {
+    'ENABLED': True,
+    'SLOW_QUERY_MS': 100,
+}
+
+# Кэш пользователей для JWT-аутентификации: LRU процесса
+# и, при необходимости, общий кэш из CACHES.
+JWT_USER_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+    'SHARED_CACHE': None,
 }
 
 SIMPLE_JWT = {
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0004_titles_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='titles',
+            index=models.Index(fields=['year'], name='titles_year'),
+        ),
+        migrations.AddIndex(
+            model_name='titles',
+            index=models.Index(fields=['category', 'year'], name='titles_category_year'),
+        ),
+        migrations.AddIndex(
+            model_name='titles',
+            index=models.Index(fields=['name'], name='titles_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('genre', 'title'), name='unique_genre_title'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0006_title_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='titles',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено'),
+        ),
+    ]
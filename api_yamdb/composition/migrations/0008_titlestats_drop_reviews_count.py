@@ -0,0 +1,17 @@
+# Generated by Django 2.2.16 on 2026-10-18 16:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0007_titles_updated'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='titlestats',
+            name='reviews_count',
+        ),
+    ]
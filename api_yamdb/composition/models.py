@@ -74,18 +74,86 @@ class Titles(models.Model):
         max_length=3000,
         verbose_name='Описание'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    # Меняется и при записи отзывов и комментариев к произведению.
+    updated = models.DateTimeField('Изменено', auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year'], name='titles_year'),
+            models.Index(
+                fields=['category', 'year'], name='titles_category_year'),
+            models.Index(fields=['name'], name='titles_name'),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+class TitleStats(models.Model):
+    """
+    Гистограмма оценок произведения, обновляется при записи отзывов.
+    Число отзывов хранится в Titles.rating_count."""
+    SCORES = range(1, 11)
+
+    title = models.OneToOneField(
+        Titles,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self) -> str:
+        return f'{self.title_id}: {self.score_histogram}'
+
+    @property
+    def score_histogram(self):
+        return {
+            str(score): getattr(self, f'score_{score}')
+            for score in self.SCORES
+        }
+
+
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genres, on_delete=models.CASCADE)
     title = models.ForeignKey(Titles, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'], name='unique_genre_title')
+        ]
+
     def __str__(self) -> str:
         return f'{self.genre} {self.title}'
@@ -0,0 +1,99 @@
+"""Пакетное создание произведений для POST /api/v1/titles/bulk/."""
+from django.db import connections, router, transaction
+from django.db.models import AutoField
+
+from composition.models import Author, Categories, Genres, GenreTitle, Titles
+
+from . import changes, search
+
+
+def insert_titles(titles):
+    """
+    Вставляет произведения и проставляет им id. Вызывать в транзакции.
+
+    Где БД возвращает id из bulk_create, хватает одного запроса. SQLite
+    их не возвращает: первое произведение вставляется отдельно и
+    получает id, как в Model.save(). Этот INSERT держит блокировку
+    записи до COMMIT, поэтому следующие id никто не займёт, и остальным
+    они задаются явно."""
+    connection = connections[router.db_for_write(Titles)]
+    if connection.features.can_return_ids_from_bulk_insert:
+        Titles.objects.bulk_create(titles)
+        return
+    first, rest = titles[0], titles[1:]
+    fields = [
+        field for field in Titles._meta.concrete_fields
+        if not isinstance(field, AutoField)
+    ]
+    first.pk = Titles._base_manager._insert(
+        [first], fields=fields, return_id=True, using=connection.alias
+    )
+    for offset, title in enumerate(rest, start=1):
+        title.pk = first.pk + offset
+    Titles.objects.bulk_create(rest)
+
+
+def bulk_create_titles(items):
+    """
+    Создаёт произведения пачкой: по одному IN-запросу на категории,
+    жанры, авторов и дубликаты, затем bulk_create произведений и связей.
+    bulk_create не вызывает сигналы: индекс и журнал изменений пишутся
+    в той же транзакции, кэш ответов сбрасывает вызывающий код.
+    Возвращает словарь индекс -> id или ошибки."""
+    categories = dict(Categories.objects.filter(
+        slug__in={data['category'] for _, data in items}
+    ).values_list('slug', 'id'))
+    genres = dict(Genres.objects.filter(
+        slug__in={slug for _, data in items for slug in data['genre']}
+    ).values_list('slug', 'id'))
+    authors = dict(Author.objects.filter(
+        slug__in={data['author'] for _, data in items if 'author' in data}
+    ).values_list('slug', 'id'))
+    existing = set(Titles.objects.filter(
+        name__in={data['name'] for _, data in items}
+    ).values_list('name', 'year', 'category_id'))
+
+    results = {}
+    accepted = []
+    for index, data in items:
+        errors = {}
+        category_id = categories.get(data['category'])
+        if category_id is None:
+            errors['category'] = ['Категория не найдена.']
+        unknown = [slug for slug in data['genre'] if slug not in genres]
+        if unknown:
+            errors['genre'] = [f'Жанр не найден: {slug}.' for slug in unknown]
+        if 'author' in data and data['author'] not in authors:
+            errors['author'] = ['Автор не найден.']
+        key = (data['name'], data['year'], category_id)
+        if not errors and key in existing:
+            errors['non_field_errors'] = [
+                'Произведение с такими name, year, category уже существует.'
+            ]
+        if errors:
+            results[index] = {'errors': errors}
+            continue
+        existing.add(key)
+        title = Titles(
+            name=data['name'],
+            year=data['year'],
+            description=data.get('description'),
+            category_id=category_id,
+            author_id=authors.get(data.get('author'))
+        )
+        accepted.append((index, title, data['genre']))
+
+    if accepted:
+        with transaction.atomic():
+            insert_titles([title for _, title, _ in accepted])
+            GenreTitle.objects.bulk_create(
+                GenreTitle(title_id=title.pk, genre_id=genres[slug])
+                for _, title, slugs in accepted
+                for slug in dict.fromkeys(slugs)
+            )
+            titles = [title for _, title, _ in accepted]
+            search.index_titles(titles)
+            changes.record('titles', [title.pk for title in titles])
+        for index, title, _ in accepted:
+            results[index] = {'id': title.pk}
+    return results, [title for _, title, _ in accepted]
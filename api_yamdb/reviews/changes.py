@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+from composition.models import Categories, Genres, GenreTitle, Titles
+
+from .models import ChangeLog, Comment, Reviews
+
+# Тип записи журнала -> модель и поля текущего состояния объекта.
+KINDS = {
+    'titles': (Titles, {
+        'id': 'id', 'name': 'name', 'year': 'year',
+        'description': 'description', 'category': 'category__slug',
+        'rating': 'rating',
+    }),
+    'reviews': (Reviews, {
+        'id': 'id', 'title': 'title_id', 'author': 'author__username',
+        'text': 'text', 'score': 'score', 'pub_date': 'pub_date',
+    }),
+    'comments': (Comment, {
+        'id': 'id', 'review': 'review_id', 'author': 'author__username',
+        'text': 'text', 'pub_date': 'pub_date',
+    }),
+    'genres': (Genres, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+    'categories': (Categories, {'id': 'id', 'name': 'name', 'slug': 'slug'}),
+}
+MODEL_KINDS = {model: kind for kind, (model, _) in KINDS.items()}
+
+
+def record(kind, object_ids, action=ChangeLog.UPSERT):
+    """Добавляет записи в журнал одним INSERT."""
+    ChangeLog.objects.bulk_create(
+        ChangeLog(kind=kind, object_id=object_id, action=action)
+        for object_id in object_ids
+    )
+
+
+def load_objects(kind, ids):
+    """Текущее состояние объектов одного типа: id -> словарь полей."""
+    model, fields = KINDS[kind]
+    rows = model.objects.filter(pk__in=ids).values_list(*fields.values())
+    objects = {row[0]: dict(zip(fields, row)) for row in rows}
+    if kind == 'titles':
+        for row in objects.values():
+            row['genres'] = []
+        for title_id, slug in GenreTitle.objects.filter(
+                title_id__in=objects).order_by('id').values_list(
+                    'title_id', 'genre__slug'):
+            objects[title_id]['genres'].append(slug)
+    return objects
+
+
+def changes_since(since, limit, kinds=None):
+    """
+    Изменения после номера since, не больше limit, и признак того,
+    что есть ещё. Состояние объектов читается одним запросом на тип,
+    поэтому стоимость зависит от числа изменений, а не от объёма данных.
+
+    Номера монотонны в порядке фиксации, пока записи в БД идут
+    последовательно (как в SQLite)."""
+    entries = ChangeLog.objects.filter(id__gt=since).order_by('id')
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    entries = list(entries.values_list(
+        'id', 'kind', 'object_id', 'action', 'created'
+    )[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    upserts = defaultdict(set)
+    for _, kind, object_id, action, _ in entries:
+        if action == ChangeLog.UPSERT:
+            upserts[kind].add(object_id)
+    objects = {
+        kind: load_objects(kind, ids) for kind, ids in upserts.items()
+    }
+    changes = [
+        {
+            'seq': seq,
+            'kind': kind,
+            'id': object_id,
+            'action': action,
+            'created': created,
+            # Объект мог быть удалён позже - об этом будет своя запись.
+            'data': objects.get(kind, {}).get(object_id),
+        }
+        for seq, kind, object_id, action, created in entries
+    ]
+    return changes, has_more
@@ -0,0 +1,166 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from composition.models import GenreTitle, Titles
+
+from .models import Comment, Reviews
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+INCLUDES = ('reviews', 'comments')
+
+TITLE_COLUMNS = (
+    'id', 'name', 'year', 'description', 'category', 'genres', 'rating',
+    'updated'
+)
+REVIEW_COLUMNS = ('id', 'author', 'score', 'text', 'pub_date')
+COMMENT_COLUMNS = ('id', 'author', 'text', 'pub_date')
+
+
+def group_by(rows, key):
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row.pop(key)].append(row)
+    return groups
+
+
+def attach_related(chunk, include):
+    """Дополняет пачку произведений жанрами и отзывами: запрос на связь."""
+    ids = [title['id'] for title in chunk]
+    genres = defaultdict(list)
+    for title_id, slug in GenreTitle.objects.filter(
+            title_id__in=ids).order_by('id').values_list(
+                'title_id', 'genre__slug').iterator():
+        genres[title_id].append(slug)
+    reviews = {}
+    if 'reviews' in include:
+        reviews = group_by(
+            Reviews.objects.filter(title_id__in=ids).order_by(
+                'title_id', 'id'
+            ).values(
+                'id', 'title_id', 'author__username', 'score', 'text',
+                'pub_date'
+            ).iterator(),
+            'title_id'
+        )
+    comments = {}
+    if 'comments' in include:
+        comments = group_by(
+            Comment.objects.filter(review__title_id__in=ids).order_by(
+                'review_id', 'id'
+            ).values(
+                'id', 'review_id', 'author__username', 'text', 'pub_date'
+            ).iterator(),
+            'review_id'
+        )
+    for title in chunk:
+        category_slug = title.pop('category__slug')
+        category_name = title.pop('category__name')
+        title['category'] = category_slug and {
+            'slug': category_slug, 'name': category_name
+        }
+        title['genres'] = genres.get(title['id'], [])
+        if title['rating'] is not None:
+            title['rating'] = round(title['rating'], 2)
+        if 'reviews' in include:
+            title['reviews'] = reviews.get(title['id'], [])
+            for review in title['reviews']:
+                review['author'] = review.pop('author__username')
+                if 'comments' in include:
+                    review['comments'] = comments.get(review['id'], [])
+                    for comment in review['comments']:
+                        comment['author'] = comment.pop('author__username')
+        yield title
+
+
+def iter_titles(updated_since=None, include=(), chunk_size=1000):
+    """
+    Отдаёт произведения словарями, не держа в памяти весь каталог:
+    произведения читаются курсором .iterator(), связанные данные -
+    одним запросом на каждую пачку из chunk_size произведений."""
+    include = set(include)
+    if 'comments' in include:
+        include.add('reviews')
+    titles = Titles.objects.order_by('id').values(
+        'id', 'name', 'year', 'description', 'rating', 'updated',
+        'category__slug', 'category__name'
+    )
+    if updated_since is not None:
+        titles = titles.filter(updated__gte=updated_since)
+    rows = titles.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from attach_related(chunk, include)
+
+
+def ndjson_lines(titles):
+    for title in titles:
+        yield json.dumps(
+            title, cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+
+class Echo:
+    """Буфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(titles, include=()):
+    """
+    Плоская таблица: строка на каждый комментарий (или отзыв без
+    комментариев), поля произведения и отзыва повторяются."""
+    columns = list(TITLE_COLUMNS)
+    if 'reviews' in include or 'comments' in include:
+        columns += [f'review_{name}' for name in REVIEW_COLUMNS]
+    if 'comments' in include:
+        columns += [f'comment_{name}' for name in COMMENT_COLUMNS]
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for title in titles:
+        category = title['category']
+        row = [
+            title['id'], title['name'], title['year'], title['description'],
+            category and category['slug'], ','.join(title['genres']),
+            title['rating'], title['updated'].isoformat()
+        ]
+        if 'reviews' not in title:
+            yield writer.writerow(row)
+            continue
+        for review in title['reviews'] or [None]:
+            review_row = row + csv_values(review, REVIEW_COLUMNS)
+            if 'comments' not in include:
+                yield writer.writerow(review_row)
+                continue
+            comments = review['comments'] if review else []
+            for comment in comments or [None]:
+                yield writer.writerow(
+                    review_row + csv_values(comment, COMMENT_COLUMNS)
+                )
+
+
+def csv_values(item, columns):
+    if item is None:
+        return [''] * len(columns)
+    return [
+        item[name].isoformat() if name == 'pub_date' else item[name]
+        for name in columns
+    ]
+
+
+def export_lines(output='ndjson', updated_since=None, include=(),
+                 chunk_size=1000):
+    """Строки выгрузки в формате output ('ndjson' или 'csv')."""
+    titles = iter_titles(updated_since, include, chunk_size)
+    if output == 'csv':
+        return csv_lines(titles, include)
+    return ndjson_lines(titles)
@@ -0,0 +1,109 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import MailQueue
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mail-queue')
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """Ставит письма в очередь; отправка - после коммита транзакции."""
+    MailQueue.objects.bulk_create(
+        MailQueue(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient=recipient
+        )
+        for recipient in recipient_list
+    )
+    if settings.MAIL_QUEUE['EAGER']:
+        transaction.on_commit(send_queued_mail)
+    elif settings.MAIL_QUEUE['USE_THREAD']:
+        transaction.on_commit(lambda: executor.submit(send_in_worker))
+
+
+def send_in_worker():
+    """Отправка в потоке очереди: соединения с БД потока закрываются."""
+    try:
+        send_queued_mail()
+    finally:
+        connections.close_all()
+
+
+def claim_batch(batch_size):
+    """Помечает пачку писем как взятую в работу этим обработчиком."""
+    now = timezone.now()
+    pending = MailQueue.objects.filter(
+        sent_at__isnull=True,
+        next_attempt__lte=now,
+        attempts__lt=settings.MAIL_QUEUE['MAX_ATTEMPTS']
+    )
+    ids = list(pending.values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    claim = uuid.uuid4()
+    pending.filter(id__in=ids).update(
+        claim=claim,
+        next_attempt=now + timedelta(seconds=settings.MAIL_QUEUE['LEASE'])
+    )
+    return list(MailQueue.objects.filter(claim=claim))
+
+
+def mark_failed(item, error):
+    """Ещё одна неудачная попытка: повтор с экспоненциальной паузой."""
+    retry_in = settings.MAIL_QUEUE['RETRY_DELAY'] * 2 ** item.attempts
+    MailQueue.objects.filter(pk=item.pk).update(
+        attempts=F('attempts') + 1,
+        last_error=str(error),
+        next_attempt=timezone.now() + timedelta(seconds=retry_in)
+    )
+
+
+def send_queued_mail(batch_size=None):
+    """Отправляет очередь пачками; возвращает (отправлено, с ошибкой)."""
+    batch_size = batch_size or settings.MAIL_QUEUE['BATCH_SIZE']
+    sent = failed = 0
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return sent, failed
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            # Сервер недоступен: попытка засчитывается всей пачке,
+            # остальные письма ждут следующего прохода.
+            for item in batch:
+                mark_failed(item, error)
+            return sent, failed + len(batch)
+        delivered = []
+        try:
+            for item in batch:
+                email = EmailMessage(
+                    item.subject,
+                    item.message,
+                    item.from_email,
+                    [item.recipient],
+                    connection=connection
+                )
+                try:
+                    email.send()
+                except Exception as error:
+                    failed += 1
+                    mark_failed(item, error)
+                else:
+                    delivered.append(item.pk)
+        finally:
+            connection.close()
+        MailQueue.objects.filter(pk__in=delivered).update(
+            sent_at=timezone.now(), attempts=F('attempts') + 1
+        )
+        sent += len(delivered)
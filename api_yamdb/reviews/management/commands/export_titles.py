@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reviews import export
+
+
+class Command(BaseCommand):
+    help = 'Выгружает каталог произведений в NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            dest='output_format',
+            choices=list(export.FORMATS),
+            default='ndjson'
+        )
+        parser.add_argument(
+            '--include',
+            action='append',
+            choices=export.INCLUDES,
+            default=[],
+            help='Добавить отзывы или комментарии (можно повторять)'
+        )
+        parser.add_argument(
+            '--updated-since',
+            help='Только произведения, изменённые после даты (ISO 8601)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки, по умолчанию stdout'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help='Произведений в одной пачке запросов'
+        )
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options['updated_since']:
+            updated_since = parse_datetime(options['updated_since'])
+            if updated_since is None:
+                raise CommandError('--updated-since: неверный формат даты')
+            if timezone.is_naive(updated_since):
+                updated_since = timezone.make_aware(updated_since)
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть больше нуля')
+        lines = export.export_lines(
+            options['output_format'],
+            updated_since=updated_since,
+            include=options['include'],
+            chunk_size=options['chunk_size']
+        )
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
@@ -0,0 +1,187 @@
+import csv
+import os
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.cache import invalidate_responses
+from composition.models import Categories, Genres, GenreTitle, Titles
+from reviews import changes, search
+from reviews.models import Comment, Reviews, User
+from reviews.rating import rebuild_ratings, rebuild_title_stats
+
+DEFAULT_PATH = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+def build_user(row, ids):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'] or 'user',
+        bio=row['bio'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+    )
+
+
+def build_category(row, ids):
+    return Categories(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_genre(row, ids):
+    return Genres(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_title(row, ids):
+    category_id = int(row['category']) if row['category'] else None
+    if category_id not in ids[Categories]:
+        category_id = None
+    return Titles(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'],
+        category_id=category_id,
+        description=row.get('description') or None,
+    )
+
+
+def build_genre_title(row, ids):
+    title_id, genre_id = int(row['title_id']), int(row['genre_id'])
+    if title_id not in ids[Titles] or genre_id not in ids[Genres]:
+        return None
+    return GenreTitle(id=row['id'], title_id=title_id, genre_id=genre_id)
+
+
+def build_review(row, ids):
+    title_id, author_id = int(row['title_id']), int(row['author'])
+    if title_id not in ids[Titles] or author_id not in ids[User]:
+        return None
+    return Reviews(
+        id=row['id'],
+        title_id=title_id,
+        author_id=author_id,
+        text=row['text'],
+        score=row['score'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+def build_comment(row, ids):
+    review_id, author_id = int(row['review_id']), int(row['author'])
+    if review_id not in ids[Reviews] or author_id not in ids[User]:
+        return None
+    return Comment(
+        id=row['id'],
+        review_id=review_id,
+        author_id=author_id,
+        text=row['text'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+# Порядок важен: таблицы загружаются после тех, на которые ссылаются.
+TABLES = (
+    ('users.csv', User, build_user),
+    ('category.csv', Categories, build_category),
+    ('genre.csv', Genres, build_genre),
+    ('titles.csv', Titles, build_title),
+    ('genre_title.csv', GenreTitle, build_genre_title),
+    ('review.csv', Reviews, build_review),
+    ('comments.csv', Comment, build_comment),
+)
+
+# Таблицы, на id которых ссылаются другие файлы.
+REFERENCED = (User, Categories, Genres, Titles, Reviews)
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_PATH,
+            help='Каталог с CSV-файлами'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help=(
+                'Сколько строк CSV читать и передавать в bulk_create за раз; '
+                'размер одного INSERT Django ограничивает сам'
+            )
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        if not os.path.isdir(path):
+            raise CommandError(f'Каталог {path} не найден')
+        # В памяти держим только множества id для проверки ссылок.
+        ids = {
+            model: set(model.objects.values_list('id', flat=True))
+            for model in REFERENCED
+        }
+        for filename, model, build in TABLES:
+            filepath = os.path.join(path, filename)
+            if not os.path.exists(filepath):
+                self.stdout.write(f'{filename}: файл не найден, пропущен')
+                continue
+            started = time.monotonic()
+            with open(filepath, encoding='utf-8', newline='') as csv_file:
+                loaded, skipped = self.load(
+                    csv.DictReader(csv_file), model, build, ids, batch_size
+                )
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{filename}: загружено {loaded}, пропущено {skipped}, '
+                f'{loaded / elapsed if elapsed else loaded:.0f} строк/с'
+            )
+        # id взяты из файлов: сдвигаем счётчики автоинкремента.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), [model for _, model, _ in TABLES]):
+                cursor.execute(sql)
+        # bulk_create не вызывает сигналы: пересчитываем рейтинг,
+        # статистику и поисковый индекс.
+        rebuild_ratings()
+        rebuild_title_stats()
+        search.rebuild_index()
+        invalidate_responses()
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
+
+    def load(self, rows, model, build, ids, batch_size):
+        loaded = skipped = 0
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                batch = []
+                for row in chunk:
+                    instance = build(row, ids)
+                    if instance is None:
+                        skipped += 1
+                        continue
+                    batch.append(instance)
+                # Размер одного INSERT Django ограничивает сам под лимиты БД.
+                model.objects.bulk_create(batch)
+                if model in changes.MODEL_KINDS:
+                    # bulk_create не вызывает сигналы журнала изменений.
+                    changes.record(
+                        changes.MODEL_KINDS[model],
+                        [obj.id for obj in batch]
+                    )
+                loaded += len(batch)
+                if model in ids:
+                    ids[model].update(int(obj.id) for obj in batch)
+        return loaded, skipped
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import invalidate_responses
+from reviews.rating import rebuild_ratings, rebuild_title_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг и статистику оценок произведений'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_ratings()
+            stats = rebuild_title_stats()
+        invalidate_responses('titles')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Пересчитан рейтинг произведений: {updated}, '
+                f'статистика с отзывами: {stats}'
+            )
+        )
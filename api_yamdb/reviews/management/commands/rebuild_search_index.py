@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews import search
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс поиска'
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stderr.write('Полнотекстовый поиск работает только с SQLite')
+            return
+        with transaction.atomic():
+            search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Индекс поиска перестроен'))
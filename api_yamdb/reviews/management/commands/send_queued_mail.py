@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди MailQueue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Количество писем на одно соединение с почтовым сервером'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval секунд'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_queued_mail(options['batch_size'])
+            except Exception as error:
+                # Обработчик в режиме --loop не должен падать от сбоя БД.
+                if not options['loop']:
+                    raise
+                self.stderr.write(f'Ошибка обработки очереди: {error}')
+                time.sleep(options['interval'])
+                continue
+            if sent or failed or not options['loop']:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, с ошибкой: {failed}'
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
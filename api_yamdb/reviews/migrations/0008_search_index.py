@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from reviews import search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(search.CREATE_SQL)
+    for sql in search.REBUILD_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    from reviews import search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(search.DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('composition', '0005_titles_filter_indexes'),
+        ('reviews', '0007_mail_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
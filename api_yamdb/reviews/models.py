@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import (
     MaxValueValidator, MinValueValidator
@@ -103,6 +104,32 @@ class Reviews(models.Model):
             models.UniqueConstraint(
                 fields=['author', 'title'], name="unique_followers")
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date'], name='reviews_title_pub_date')
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Значения из БД нужны для пересчёта рейтинга произведения.
+        self.loaded_rating = (None, None)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Отложенные через only()/defer() поля приходят как DEFERRED.
+        if not {'score', 'title_id'} & instance.get_deferred_fields():
+            instance.loaded_rating = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Отзыв и рейтинг произведения сохраняются в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         self.review = 'Автор: {}, текст: {} оценка'.format(
@@ -130,5 +157,58 @@ class Comment(models.Model):
     )
     text = models.TextField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date'], name='comment_review_pub_date')
+        ]
+
     def __str__(self):
         return self.author
+
+
+class MailQueue(models.Model):
+    """Очередь исходящих писем, отправляется вне запроса."""
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipient = models.EmailField()
+    created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    claim = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt'], name='mail_queue_pending')
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class ChangeLog(models.Model):
+    """
+    Журнал изменений для инкрементальной синхронизации: id растёт
+    монотонно, записи добавляются сигналами post_save/post_delete."""
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = (
+        (UPSERT, 'Создание или изменение'),
+        (DELETE, 'Удаление'),
+    )
+
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.id}: {self.action} {self.kind} {self.object_id}'
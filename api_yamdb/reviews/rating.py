@@ -0,0 +1,102 @@
+from django.db.models import (
+    Avg, Case, Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum,
+    Value, When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from composition.models import Titles, TitleStats
+
+from .models import Reviews
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """
+    Инкрементально пересчитывает рейтинг произведения одним UPDATE
+    и отмечает время изменения произведения."""
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    Titles.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField()
+        ),
+        updated=timezone.now()
+    )
+
+
+def touch_titles(title_ids):
+    """Отмечает изменение произведений, например, при записи комментария."""
+    Titles.objects.filter(pk__in=title_ids).update(updated=timezone.now())
+
+
+def rebuild_ratings(titles=None):
+    """Полностью пересчитывает рейтинг по таблице отзывов."""
+    if titles is None:
+        titles = Titles.objects.all()
+    reviews = Reviews.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(
+                reviews.annotate(total=Sum('score')).values('total'),
+                output_field=IntegerField()
+            ),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(
+                reviews.annotate(total=Count('pk')).values('total'),
+                output_field=IntegerField()
+            ),
+            0
+        ),
+        rating=Subquery(
+            reviews.annotate(total=Avg('score')).values('total'),
+            output_field=FloatField()
+        )
+    )
+
+
+def update_title_stats(title_id, removed=None, added=None):
+    """Сдвигает гистограмму: removed - старая оценка, added - новая."""
+    if removed == added:
+        return
+    changes = {}
+    if removed is not None:
+        changes[f'score_{removed}'] = F(f'score_{removed}') - 1
+    if added is not None:
+        changes[f'score_{added}'] = F(f'score_{added}') + 1
+    if not TitleStats.objects.filter(title_id=title_id).update(**changes):
+        # Строки ещё нет (например, произведение создано bulk_create).
+        rebuild_title_stats([title_id])
+
+
+def rebuild_title_stats(title_ids=None):
+    """Пересчитывает гистограммы оценок одним GROUP BY по отзывам."""
+    reviews = Reviews.objects.order_by()
+    stats = TitleStats.objects.all()
+    if title_ids is not None:
+        reviews = reviews.filter(title_id__in=title_ids)
+        stats = stats.filter(title_id__in=title_ids)
+    rows = reviews.values('title_id').annotate(
+        **{
+            f'score_{score}': Count('id', filter=Q(score=score))
+            for score in TitleStats.SCORES
+        }
+    )
+    stats.delete()
+    batch = []
+    created = 0
+    for row in rows.iterator():
+        batch.append(TitleStats(**row))
+        if len(batch) >= 1000:
+            TitleStats.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    TitleStats.objects.bulk_create(batch)
+    return created + len(batch)
@@ -0,0 +1,178 @@
+import html
+import re
+
+from django.db import connection
+
+# Документы всех типов лежат в одной таблице FTS5; rowid кодирует тип и id,
+# поэтому обновление и удаление идут по первичному ключу, а не сканом.
+TABLE = 'search_index'
+KINDS = {'titles': 1, 'reviews': 2, 'comments': 3}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+SNIPPET_TOKENS = 12
+# Подсветку FTS5 отмечает управляющими символами: разметка <b> добавляется
+# после экранирования текста, иначе HTML из отзывов попадёт в ответ.
+MARK_START, MARK_END = '\x02', '\x03'
+WORD = re.compile(r'\w+', re.UNICODE)
+
+CREATE_SQL = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+        name, body,
+        kind UNINDEXED, object_id UNINDEXED,
+        title_id UNINDEXED, review_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+DROP_SQL = f'DROP TABLE IF EXISTS {TABLE}'
+REBUILD_SQL = (
+    f'DELETE FROM {TABLE}',
+    f"""INSERT INTO {TABLE}
+        (rowid, name, body, kind, object_id, title_id, review_id)
+        SELECT id * 4 + 1, name, COALESCE(description, ''), 1, id, id, NULL
+        FROM composition_titles""",
+    f"""INSERT INTO {TABLE}
+        (rowid, name, body, kind, object_id, title_id, review_id)
+        SELECT id * 4 + 2, '', text, 2, id, title_id, id
+        FROM reviews_reviews""",
+    f"""INSERT INTO {TABLE}
+        (rowid, name, body, kind, object_id, title_id, review_id)
+        SELECT c.id * 4 + 3, '', c.text, 3, c.id, r.title_id, c.review_id
+        FROM reviews_comment c JOIN reviews_reviews r ON r.id = c.review_id""",
+)
+# Произведений нет - нет и отзывов с комментариями: индекс после flush.
+CLEAR_STALE_SQL = f"""DELETE FROM {TABLE}
+    WHERE NOT EXISTS (SELECT 1 FROM composition_titles)"""
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def rowid(kind, object_id):
+    return object_id * 4 + KINDS[kind]
+
+
+def index_document(kind, object_id, name, body, title_id, review_id=None):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TABLE} WHERE rowid = %s', [rowid(kind, object_id)]
+        )
+        cursor.execute(
+            f"""INSERT INTO {TABLE}
+                (rowid, name, body, kind, object_id, title_id, review_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            [rowid(kind, object_id), name, body or '', KINDS[kind],
+             object_id, title_id, review_id]
+        )
+
+
+def index_comment(comment_id, text, review_id):
+    """Индексирует комментарий; title_id берётся подзапросом к отзыву."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TABLE} WHERE rowid = %s',
+            [rowid('comments', comment_id)]
+        )
+        cursor.execute(
+            f"""INSERT INTO {TABLE}
+                (rowid, name, body, kind, object_id, title_id, review_id)
+                SELECT %s, '', %s, %s, %s, title_id, id
+                FROM reviews_reviews WHERE id = %s""",
+            [rowid('comments', comment_id), text or '', KINDS['comments'],
+             comment_id, review_id]
+        )
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и заменяет маркеры FTS5 на <b>."""
+    return html.escape(snippet).replace(MARK_START, '<b>').replace(
+        MARK_END, '</b>'
+    )
+
+
+def index_titles(titles):
+    """Индексирует пачку новых произведений одним executemany."""
+    if not is_available() or not titles:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"""INSERT INTO {TABLE}
+                (rowid, name, body, kind, object_id, title_id, review_id)
+                VALUES (%s, %s, %s, %s, %s, %s, NULL)""",
+            [
+                [rowid('titles', title.pk), title.name,
+                 title.description or '', KINDS['titles'], title.pk, title.pk]
+                for title in titles
+            ]
+        )
+
+
+def remove_document(kind, object_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TABLE} WHERE rowid = %s', [rowid(kind, object_id)]
+        )
+
+
+def rebuild_index():
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for sql in REBUILD_SQL:
+            cursor.execute(sql)
+
+
+def clear_stale_index():
+    """Очищает индекс, если таблицы моделей пусты."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(CLEAR_STALE_SQL)
+
+
+def build_match(query):
+    """Превращает ввод пользователя в безопасное выражение MATCH."""
+    words = WORD.findall(query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(query, kinds=None, limit=10, offset=0):
+    """Ищет по индексу; возвращает документы, отсортированные по bm25."""
+    match = build_match(query)
+    if not match or not is_available():
+        return []
+    params = [MARK_START, MARK_END, match]
+    kind_filter = ''
+    if kinds:
+        placeholders = ', '.join(['%s'] * len(kinds))
+        kind_filter = f'AND kind IN ({placeholders})'
+        params.extend(KINDS[kind] for kind in kinds)
+    params.extend([limit, offset])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""SELECT kind, object_id, title_id, review_id,
+                    snippet({TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS}),
+                    bm25({TABLE}, 10.0, 1.0)
+                FROM {TABLE}
+                WHERE {TABLE} MATCH %s {kind_filter}
+                ORDER BY bm25({TABLE}, 10.0, 1.0)
+                LIMIT %s OFFSET %s""",
+            params
+        )
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': KIND_NAMES[kind],
+            'id': object_id,
+            'title_id': title_id,
+            'review_id': review_id,
+            'snippet': highlight(snippet),
+            'rank': round(-rank, 4),
+        }
+        for kind, object_id, title_id, review_id, snippet, rank in rows
+    ]
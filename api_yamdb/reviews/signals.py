@@ -0,0 +1,168 @@
+from django.db import connection
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from composition.models import Categories, Genres, GenreTitle, Titles
+
+from . import changes, search
+from .models import ChangeLog, Comment, Reviews
+from .rating import (
+    rebuild_ratings, rebuild_title_stats, touch_titles, update_title_rating,
+    update_title_stats
+)
+
+
+@receiver(post_save, sender=Reviews)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_title_id, old_score = instance.loaded_rating
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+        update_title_stats(instance.title_id, added=instance.score)
+    elif old_score is None:
+        # Прежнее значение неизвестно (отложенные поля) - пересчитываем.
+        title_ids = {old_title_id, instance.title_id} - {None}
+        rebuild_ratings(Titles.objects.filter(pk__in=title_ids))
+        rebuild_title_stats(title_ids)
+        touch_titles(title_ids)
+    elif old_title_id != instance.title_id:
+        update_title_rating(old_title_id, -old_score, -1)
+        update_title_rating(instance.title_id, instance.score, 1)
+        update_title_stats(old_title_id, removed=old_score)
+        update_title_stats(instance.title_id, added=instance.score)
+    else:
+        update_title_rating(instance.title_id, instance.score - old_score, 0)
+        update_title_stats(
+            instance.title_id, removed=old_score, added=instance.score
+        )
+    instance.loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Reviews)
+def review_deleted(sender, instance, **kwargs):
+    title_id, score = instance.loaded_rating
+    if score is None:
+        rebuild_ratings(Titles.objects.filter(pk=instance.title_id))
+        rebuild_title_stats([instance.title_id])
+        touch_titles([instance.title_id])
+        return
+    update_title_rating(title_id, -score, -1)
+    update_title_stats(title_id, removed=score)
+
+
+@receiver(post_save, sender=Titles)
+def title_indexed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_document(
+        'titles', instance.pk, instance.name, instance.description,
+        instance.pk
+    )
+
+
+@receiver(post_delete, sender=Titles)
+def title_unindexed(sender, instance, **kwargs):
+    search.remove_document('titles', instance.pk)
+
+
+@receiver(post_save, sender=Reviews)
+def review_indexed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_document(
+        'reviews', instance.pk, '', instance.text, instance.title_id,
+        instance.pk
+    )
+
+
+@receiver(post_delete, sender=Reviews)
+def review_unindexed(sender, instance, **kwargs):
+    search.remove_document('reviews', instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def comment_indexed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_comment(instance.pk, instance.text, instance.review_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_unindexed(sender, instance, **kwargs):
+    search.remove_document('comments', instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Подзапрос вместо загрузки отзыва: один UPDATE на комментарий.
+    touch_titles(
+        Reviews.objects.filter(pk=instance.review_id).values('title_id')
+    )
+
+
+def object_changed(sender, instance, **kwargs):
+    changes.record(changes.MODEL_KINDS[sender], [instance.pk])
+
+
+def object_removed(sender, instance, **kwargs):
+    changes.record(
+        changes.MODEL_KINDS[sender], [instance.pk], ChangeLog.DELETE
+    )
+
+
+for model in changes.MODEL_KINDS:
+    post_save.connect(object_changed, sender=model)
+    post_delete.connect(object_removed, sender=model)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_save, sender=Reviews)
+@receiver(post_delete, sender=Reviews)
+def title_changed(sender, instance, **kwargs):
+    # Жанры и рейтинг входят в состояние произведения в журнале.
+    changes.record('titles', [instance.title_id])
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_link_changed(sender, instance, raw=False, **kwargs):
+    # Жанры входят в выгрузку: произведение считается изменённым.
+    if raw:
+        return
+    touch_titles([instance.title_id])
+
+
+@receiver(post_save, sender=Categories)
+@receiver(pre_delete, sender=Categories)
+def category_changed(sender, instance, raw=False, **kwargs):
+    # Слаг категории входит в выгрузку; SET_NULL при удалении обновляет
+    # произведения без сигналов, поэтому отмечаем их до удаления.
+    if raw:
+        return
+    touch_titles(Titles.objects.filter(category_id=instance.pk).values('pk'))
+
+
+@receiver(post_save, sender=Genres)
+def genre_changed(sender, instance, raw=False, **kwargs):
+    # При удалении жанра связи удаляются с сигналами genre_link_changed.
+    if raw:
+        return
+    touch_titles(
+        GenreTitle.objects.filter(genre_id=instance.pk).values('title_id')
+    )
+
+
+@receiver(post_migrate)
+def search_index_reset(sender, **kwargs):
+    # flush очищает таблицы моделей, но не виртуальную таблицу FTS5.
+    # Полная переиндексация - manage.py rebuild_search_index.
+    if (sender.name == 'reviews'
+            and search.TABLE in connection.introspection.table_names()):
+        search.clear_stale_index()
@@ -0,0 +1,216 @@
+"""
+Нагрузочный тест эндпоинтов /api/v1 внутри процесса.
+
+Заполняет временную БД синтетическими данными, гоняет запросы через
+настоящий URLconf конкурентными клиентами и печатает p50/p95/p99,
+запросы в секунду и число SQL-запросов на вызов для каждого маршрута.
+
+    python benchmarks/api_load.py --titles 1000 --clients 8 \\
+        --output bench.json --compare previous.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (  # noqa: E402
+    disable_response_cache, git_revision, setup_django
+)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def build_routes(data, rng):
+    """Маршрут -> (метод, функция, возвращающая URL и тело запроса)."""
+    titles = data['titles']
+    reviews = data['reviews']
+
+    def title():
+        return rng.choice(titles)
+
+    def review():
+        return rng.choice(reviews)
+
+    return {
+        'titles-list': ('get', lambda: (
+            f'/api/v1/titles/?limit=10&offset={rng.randint(0, 100)}', None)),
+        'titles-filter': ('get', lambda: (
+            f'/api/v1/titles/?genre={rng.choice(data["genres"])}'
+            f'&year_min={rng.randint(1950, 2020)}', None)),
+        'titles-detail': ('get', lambda: (
+            f'/api/v1/titles/{title()}/', None)),
+        'genres-list': ('get', lambda: ('/api/v1/genres/', None)),
+        'categories-list': ('get', lambda: ('/api/v1/categories/', None)),
+        'reviews-list': ('get', lambda: (
+            f'/api/v1/titles/{title()}/reviews/', None)),
+        'reviews-cursor': ('get', lambda: (
+            f'/api/v1/titles/{title()}/reviews/?pagination=cursor', None)),
+        'reviews-detail': ('get', lambda: (
+            '/api/v1/titles/{1}/reviews/{0}/'.format(*review()), None)),
+        'comments-list': ('get', lambda: (
+            '/api/v1/titles/{1}/reviews/{0}/comments/'.format(*review()),
+            None)),
+        'search': ('get', lambda: (
+            f'/api/v1/search/?q={rng.choice(("тень", "город", "море"))}',
+            None)),
+        'comments-create': ('post', lambda: (
+            '/api/v1/titles/{1}/reviews/{0}/comments/'.format(*review()),
+            {'text': 'Нагрузочный комментарий'})),
+    }
+
+
+class QueryCounter:
+    """Считает SQL-запросы текущего потока через execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_route(name, method, make_request, requests, clients, token):
+    from django.db import connection
+    from django.test import Client
+
+    lock = threading.Lock()
+    counter = itertools.count()
+    samples = []
+
+    def worker():
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            while next(counter) < requests:
+                url, body = make_request()
+                queries.count = 0
+                started = time.perf_counter()
+                response = getattr(client, method)(url, data=body)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    samples.append(
+                        (elapsed, queries.count, response.status_code)
+                    )
+        connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for future in [pool.submit(worker) for _ in range(clients)]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    if any(sample[2] == 429 for sample in samples):
+        raise RuntimeError(f'{name}: ответы 429, замер искажён лимитами')
+    latencies = [sample[0] * 1000 for sample in samples]
+    errors = sum(1 for sample in samples if sample[2] >= 400)
+    return {
+        'route': name,
+        'method': method.upper(),
+        'requests': len(samples),
+        'errors': errors,
+        'rps': round(len(samples) / wall, 1) if wall else 0,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries_per_request': round(
+            sum(sample[1] for sample in samples) / len(samples), 2
+        ) if samples else 0,
+    }
+
+
+def print_table(results, baseline=None):
+    baseline = {item['route']: item for item in (baseline or [])}
+    header = (f'{"route":<18}{"rps":>9}{"p50 ms":>9}{"p95 ms":>9}'
+              f'{"p99 ms":>9}{"sql/req":>9}{"err":>6}')
+    print(header)
+    print('-' * len(header))
+    for item in results:
+        line = (f'{item["route"]:<18}{item["rps"]:>9}{item["p50_ms"]:>9}'
+                f'{item["p95_ms"]:>9}{item["p99_ms"]:>9}'
+                f'{item["queries_per_request"]:>9}{item["errors"]:>6}')
+        previous = baseline.get(item['route'])
+        if previous and previous['p50_ms']:
+            change = (item['p50_ms'] / previous['p50_ms'] - 1) * 100
+            line += f'   p50 {change:+.1f}%'
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--titles', type=int, default=200)
+    parser.add_argument('--genres', type=int, default=10)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Запросов на маршрут')
+    parser.add_argument('--clients', type=int, default=4,
+                        help='Конкурентных клиентов')
+    parser.add_argument('--routes', nargs='*',
+                        help='Ограничить список маршрутов')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Отключить кэш ответов')
+    parser.add_argument('--db', help='Файл SQLite (по умолчанию временный)')
+    parser.add_argument('--output', help='Сохранить результаты в JSON')
+    parser.add_argument('--compare', help='JSON предыдущего прогона')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    setup_django(args.db)
+    if args.no_cache:
+        disable_response_cache()
+
+    from benchmarks.dataset import seed
+    from rest_framework_simplejwt.tokens import AccessToken
+    from reviews.models import User
+
+    started = time.perf_counter()
+    data = seed(
+        titles=args.titles,
+        genres=args.genres,
+        reviews_per_title=args.reviews_per_title,
+        comments_per_review=args.comments_per_review,
+        random_seed=args.seed
+    )
+    print(f'Данные созданы за {time.perf_counter() - started:.1f} с')
+    token = str(AccessToken.for_user(User.objects.get(pk=data['users'][0])))
+
+    rng = random.Random(args.seed)
+    routes = build_routes(data, rng)
+    results = []
+    for name, (method, make_request) in routes.items():
+        if args.routes and name not in args.routes:
+            continue
+        results.append(run_route(
+            name, method, make_request, args.requests, args.clients, token
+        ))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({
+                'revision': git_revision(),
+                'parameters': vars(args),
+                'results': results,
+            }, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
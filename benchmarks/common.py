@@ -0,0 +1,57 @@
+"""Общая настройка Django для бенчмарков: отдельная временная БД."""
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'api_yamdb')
+
+
+def setup_django(db_path=None):
+    """Настраивает Django на временный файл SQLite и применяет миграции."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='yamdb-bench-'), 'db')
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['*']
+    # Один токен шлёт сотни запросов: с лимитами create-маршруты
+    # мерили бы ответы 429, а не запись.
+    settings.THROTTLE = dict(settings.THROTTLE, RATES={})
+    django.setup()
+
+    import warnings
+    from django.core.management import call_command
+    from django.core.paginator import UnorderedObjectListWarning
+
+    warnings.simplefilter('ignore', UnorderedObjectListWarning)
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def disable_response_cache():
+    from django.conf import settings
+
+    settings.CACHES['benchmark-dummy'] = {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+    settings.API_RESPONSE_CACHE = dict(
+        settings.API_RESPONSE_CACHE, CACHE='benchmark-dummy'
+    )
+
+
+def git_revision():
+    import subprocess
+
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,104 @@
+"""Генератор синтетического каталога для нагрузочных тестов."""
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+WORDS = (
+    'побег', 'отец', 'тень', 'город', 'ночь', 'дорога', 'море', 'война',
+    'песня', 'сердце', 'звезда', 'время', 'огонь', 'тайна', 'дом', 'зима',
+)
+
+
+def sentence(rng, size):
+    return ' '.join(rng.choice(WORDS) for _ in range(size)).capitalize()
+
+
+@transaction.atomic
+def seed(titles=100, genres=10, categories=3, reviews_per_title=5,
+         comments_per_review=2, random_seed=0):
+    """Заполняет БД и возвращает id созданных объектов для запросов."""
+    from api.cache import invalidate_responses
+    from composition.models import Categories, Genres, GenreTitle, Titles
+    from reviews import search
+    from reviews.models import Comment, Reviews, User
+    from reviews.rating import rebuild_ratings, rebuild_title_stats
+
+    rng = random.Random(random_seed)
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(max(reviews_per_title, 1))
+    )
+    users = list(User.objects.filter(username__startswith='bench'))
+    Categories.objects.bulk_create(
+        Categories(name=f'Категория {i}', slug=f'bench-category-{i}')
+        for i in range(categories)
+    )
+    category_ids = list(Categories.objects.values_list('id', flat=True))
+    Genres.objects.bulk_create(
+        Genres(name=f'Жанр {i}', slug=f'bench-genre-{i}')
+        for i in range(genres)
+    )
+    genre_ids = list(Genres.objects.values_list('id', flat=True))
+
+    Titles.objects.bulk_create(
+        (
+            Titles(
+                name=sentence(rng, 3),
+                year=rng.randint(1950, 2020),
+                category_id=rng.choice(category_ids),
+                description=sentence(rng, 30)
+            )
+            for _ in range(titles)
+        )
+    )
+    title_ids = list(Titles.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create(
+        (
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in rng.sample(genre_ids, min(2, len(genre_ids)))
+        )
+    )
+
+    now = timezone.now()
+    Reviews.objects.bulk_create(
+        (
+            Reviews(
+                title_id=title_id,
+                author=author,
+                text=sentence(rng, 40),
+                score=rng.randint(1, 10),
+                pub_date=now - timedelta(minutes=rng.randint(0, 10 ** 6))
+            )
+            for title_id in title_ids
+            for author in users[:reviews_per_title]
+        )
+    )
+    review_ids = list(Reviews.objects.values_list('id', 'title_id'))
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                review_id=review_id,
+                author=rng.choice(users),
+                text=sentence(rng, 15),
+                pub_date=now - timedelta(minutes=rng.randint(0, 10 ** 6))
+            )
+            for review_id, _ in review_ids
+            for _ in range(comments_per_review)
+        )
+    )
+    rebuild_ratings()
+    rebuild_title_stats()
+    search.rebuild_index()
+    invalidate_responses()
+    return {
+        'users': [user.pk for user in users],
+        'titles': title_ids,
+        'reviews': review_ids,
+        'genres': list(Genres.objects.values_list('slug', flat=True)),
+        'categories': list(
+            Categories.objects.values_list('slug', flat=True)
+        ),
+    }
@@ -0,0 +1,125 @@
+"""
+Время кодирования/декодирования и размер страницы ответа в JSON и
+MessagePack для TitlesViewSerializer и ReviewsSerializer, а также
+объекты в секунду: ModelSerializer против плана .values() (api.values).
+
+    python benchmarks/serialization.py --page-size 100 --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+
+def best_of(func, repeat):
+    """Лучшее время одного вызова из repeat, в миллисекундах."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def build_pages(page_size):
+    from api.serializers import ReviewsSerializer, TitlesViewSerializer
+    from composition.models import Titles
+    from reviews.models import Reviews
+
+    titles = Titles.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')[:page_size]
+    reviews = Reviews.objects.select_related('author').order_by(
+        '-pub_date'
+    )[:page_size]
+    return {
+        'titles': TitlesViewSerializer(titles, many=True).data,
+        'reviews': ReviewsSerializer(reviews, many=True).data,
+    }
+
+
+def build_readers(page_size):
+    """Чтение страницы из БД и сериализация: обычный путь и план."""
+    from api.serializers import ReviewsSerializer, TitlesViewSerializer
+    from api.values import get_plan
+    from composition.models import Titles
+    from reviews.models import Reviews
+
+    titles = Titles.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')
+    reviews = Reviews.objects.select_related('author').only(
+        'id', 'title', 'text', 'score', 'pub_date', 'author__username'
+    ).order_by('-pub_date')
+    readers = {}
+    for name, queryset, serializer_class in (
+            ('titles', titles, TitlesViewSerializer),
+            ('reviews', reviews, ReviewsSerializer)):
+        plan = get_plan(serializer_class)
+        readers[name] = {
+            'serializer': lambda queryset=queryset, cls=serializer_class: (
+                cls(queryset[:page_size], many=True).data
+            ),
+            'values': lambda queryset=queryset, plan=plan: plan.serialize(
+                plan.queryset(queryset)[:page_size]
+            ),
+        }
+    return readers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    import json
+
+    import msgpack
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import MessagePackRenderer
+    from benchmarks.dataset import seed
+
+    seed(titles=args.titles, reviews_per_title=3, comments_per_review=0)
+    formats = {
+        'json': (JSONRenderer(), json.loads),
+        'msgpack': (
+            MessagePackRenderer(),
+            lambda body: msgpack.unpackb(body, raw=False)
+        ),
+    }
+    print(
+        f'{"page":<10}{"format":<10}{"bytes":>10}'
+        f'{"encode ms":>12}{"decode ms":>12}'
+    )
+    for name, data in build_pages(args.page_size).items():
+        for fmt, (renderer, decode) in formats.items():
+            body = renderer.render(data)
+            encode_ms = best_of(lambda: renderer.render(data), args.repeat)
+            decode_ms = best_of(lambda: decode(body), args.repeat)
+            print(
+                f'{name:<10}{fmt:<10}{len(body):>10}'
+                f'{encode_ms:>12.3f}{decode_ms:>12.3f}'
+            )
+
+    print()
+    print(f'{"page":<10}{"path":<12}{"ms":>10}{"objects/s":>12}')
+    for name, paths in build_readers(args.page_size).items():
+        assert paths['values']() == paths['serializer'](), name
+        for path, read in paths.items():
+            elapsed_ms = best_of(read, args.repeat)
+            print(
+                f'{name:<10}{path:<12}{elapsed_ms:>10.3f}'
+                f'{args.page_size / elapsed_ms * 1000:>12.0f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Смешанная нагрузка чтение/запись на SQLite с настройками по умолчанию
+и с SQLITE_PRAGMAS (WAL, synchronous=NORMAL, mmap, cache, busy_timeout).
+
+    python benchmarks/sqlite_tuning.py --readers 6 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+
+def run_mode(name, pragmas, args, data):
+    from django.conf import settings
+    from django.db import OperationalError, connection
+
+    from composition.models import Titles
+    from reviews.models import Comment
+
+    settings.SQLITE_PRAGMAS = pragmas
+    connection.close()
+    reviews = data['reviews']
+    stop = time.perf_counter() + args.seconds
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        done = 0
+        while time.perf_counter() < stop:
+            titles = Titles.objects.select_related('category').order_by(
+                'id'
+            )[:10]
+            list(titles)
+            done += 1
+        connection.close()
+        with lock:
+            counts['reads'] += done
+
+    def writer(index):
+        done = errors = 0
+        while time.perf_counter() < stop:
+            review_id, _ = reviews[(index + done) % len(reviews)]
+            try:
+                Comment.objects.create(
+                    review_id=review_id,
+                    author_id=data['users'][0],
+                    text='Нагрузочный комментарий'
+                )
+                done += 1
+            except OperationalError:
+                errors += 1
+        connection.close()
+        with lock:
+            counts['writes'] += done
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [
+        threading.Thread(target=writer, args=(i,))
+        for i in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(
+        f'{name:<10}'
+        f'{counts["reads"] / args.seconds:>12.1f}'
+        f'{counts["writes"] / args.seconds:>12.1f}'
+        f'{counts["errors"]:>10}'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=6)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--titles', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    setup_django(os.path.join(tempfile.mkdtemp(prefix='yamdb-sqlite-'), 'db'))
+    from django.conf import settings
+    from django.db import connection
+
+    from benchmarks.dataset import seed
+
+    tuned = dict(settings.SQLITE_PRAGMAS)
+    data = seed(titles=args.titles, reviews_per_title=3)
+    print(f'{"mode":<10}{"reads/s":>12}{"writes/s":>12}{"errors":>10}')
+    # Сначала возвращаем журнал в режим по умолчанию: WAL хранится в файле.
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode = DELETE')
+    run_mode('default', {}, args, data)
+    run_mode('tuned', tuned, args, data)
+
+
+if __name__ == '__main__':
+    main()
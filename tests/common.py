@@ -2,6 +2,11 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from composition.models import Categories, Genres, GenreTitle, Titles
+from reviews.models import Comment, Reviews
+
+CATALOGUE_GENRES = (('Драма', 'drama'), ('Комедия', 'comedy'))
+
 
 def create_users_api(admin_client):
     data = {
@@ -113,3 +118,40 @@ def create_comments(admin_client, admin):
     result.append({'id': create_comment(client_moderator, titles[0]["id"], reviews[0]["id"], 'qwerty321'),
                    'author': moderator.username, 'text': 'qwerty321'})
     return result, reviews, titles, user, moderator
+
+
+def create_title(name='Поворот туда', year=2000, category=None, genres=(),
+                 **fields):
+    title = Titles.objects.create(
+        name=name, year=year, category=category, **fields
+    )
+    for genre in genres:
+        GenreTitle.objects.create(genre=genre, title=title)
+    return title
+
+
+def create_catalogue(count=1, genres=1, start=0, **fields):
+    """
+    Произведения «Произведение N» в категории «Фильм» с первыми genres
+    жанрами; повторный вызов добавляет их в те же категорию и жанры."""
+    category, _ = Categories.objects.get_or_create(
+        name='Фильм', slug='films'
+    )
+    genres = [
+        Genres.objects.get_or_create(name=name, slug=slug)[0]
+        for name, slug in CATALOGUE_GENRES[:genres]
+    ]
+    return [
+        create_title(f'Произведение {index}', 2000, category, genres,
+                     **fields)
+        for index in range(start, start + count)
+    ]
+
+
+def add_review(title, author, text='Отзыв', score=7, comments=()):
+    review = Reviews.objects.create(
+        title=title, author=author, text=text, score=score
+    )
+    for comment in comments:
+        Comment.objects.create(review=review, author=author, text=comment)
+    return review
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_mail_queue(settings):
+    settings.MAIL_QUEUE = dict(settings.MAIL_QUEUE, EAGER=True)
@@ -0,0 +1,58 @@
+import pytest
+from django.core.management import call_command
+
+from composition.models import Titles
+from reviews.models import Reviews
+
+
+class Test08TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin, moderator, user):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        assert title.rating is None and title.rating_count == 0, (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+        Reviews.objects.create(title=title, author=admin, text='a', score=4)
+        review = Reviews.objects.create(
+            title=title, author=user, text='b', score=8
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (12, 2)
+        assert title.rating == 6, (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва'
+        )
+
+        review = Reviews.objects.get(pk=review.pk)
+        review.score = 2
+        review.save()
+        title.refresh_from_db()
+        assert title.rating == 3, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки'
+        )
+
+        review.delete()
+        title.refresh_from_db()
+        assert title.rating == 4 and title.rating_count == 1, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+        )
+
+        Reviews.objects.filter(title=title).delete()
+        title.refresh_from_db()
+        assert title.rating is None and title.rating_sum == 0, (
+            'Проверьте, что без отзывов рейтинг сбрасывается в `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings_command(self, admin, user):
+        title = Titles.objects.create(name='Проект', year=2020)
+        Reviews.objects.create(title=title, author=admin, text='a', score=5)
+        Reviews.objects.create(title=title, author=user, text='b', score=10)
+        Titles.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (15, 2)
+        assert title.rating == 7.5, (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг'
+        )
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_catalogue
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+class Test09TitleQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_queries_constant(self, client):
+        create_catalogue(2, genres=2)
+        small = count_queries(client, '/api/v1/titles/?limit=20')
+        create_catalogue(10, genres=2, start=2)
+        large = count_queries(client, '/api/v1/titles/?limit=20')
+        assert small == large, (
+            'Проверьте, что число SQL-запросов при GET запросе `/api/v1/titles/` '
+            'не зависит от количества произведений на странице'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries_constant(self, client):
+        [title] = create_catalogue(genres=2)
+        queries = count_queries(client, f'/api/v1/titles/{title.id}/')
+        assert queries <= 2, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/` получает '
+            'произведение с категорией одним запросом, а жанры - вторым'
+        )
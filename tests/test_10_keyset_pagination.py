@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from composition.models import Titles
+from reviews.models import Comment, Reviews
+
+
+class Test10KeysetPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comments_cursor_pagination(self, client, admin):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        review = Reviews.objects.create(
+            title=title, author=admin, text='qwerty', score=5
+        )
+        for i in range(25):
+            Comment.objects.create(review=review, author=admin, text=str(i))
+        # Одинаковая дата у части записей проверяет сортировку по id.
+        first = Comment.objects.order_by('id').first()
+        Comment.objects.filter(id__lte=first.id + 12).update(
+            pub_date=first.pub_date
+        )
+
+        url = (f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+               '?pagination=cursor')
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200, (
+                'Проверьте, что пагинация по курсору возвращает статус 200'
+            )
+            assert not any(
+                'COUNT(' in query['sql'] for query in context.captured_queries
+            ), 'Проверьте, что пагинация по курсору не выполняет COUNT'
+            data = response.json()
+            assert 'count' not in data and len(data['results']) <= 10
+            seen.extend(comment['id'] for comment in data['results'])
+            url = data['next']
+
+        expected = list(
+            Comment.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert seen == expected, (
+            'Проверьте, что пагинация по курсору возвращает все комментарии '
+            'по убыванию `pub_date` и `id` без пропусков и повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalid_cursor(self, client, admin):
+        title = Titles.objects.create(name='Проект', year=2020)
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=%21%21'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что при неверном курсоре возвращается статус 404'
+        )
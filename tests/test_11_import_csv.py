@@ -0,0 +1,25 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from composition.models import GenreTitle, Titles
+from reviews.models import Comment, Reviews, User
+
+
+class Test11ImportCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_static_data(self):
+        call_command('import_csv', batch_size=10, stdout=StringIO())
+        assert User.objects.count() == 5
+        assert Titles.objects.count() == 32
+        assert GenreTitle.objects.count() == 42
+        assert Reviews.objects.count() == 72
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что команда `import_csv` загружает все CSV-файлы'
+        )
+        title = Titles.objects.get(pk=1)
+        assert title.rating_count == title.reviews.count() > 0, (
+            'Проверьте, что после загрузки пересчитывается рейтинг'
+        )
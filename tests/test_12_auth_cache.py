@@ -0,0 +1,68 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import (
+    CACHE_KEY, cache_settings, clear_users, local_cache
+)
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query for query in context.captured_queries
+        if 'reviews_user' in query['sql']
+    ]
+
+
+class Test12AuthCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_user_resolution(self, admin, admin_client):
+        user_queries(admin_client, '/api/v1/users/')
+        queries = user_queries(admin_client, '/api/v1/genres/')
+        assert not queries, (
+            'Проверьте, что при повторном запросе с тем же токеном '
+            'пользователь берётся из кэша без запроса к БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_invalidated_on_save(self, admin, admin_client):
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 403, (
+            'Проверьте, что кэш пользователя сбрасывается при сохранении `User`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidated_after_commit(self, admin, admin_client):
+        key = CACHE_KEY.format(admin.pk)
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        with transaction.atomic():
+            admin.role = 'user'
+            admin.save()
+            assert local_cache.get(key) is not None, (
+                'Проверьте, что кэш пользователя сбрасывается после COMMIT'
+            )
+        assert local_cache.get(key) is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_reset_keeps_shared_cache(self, admin, admin_client,
+                                         monkeypatch):
+        monkeypatch.setitem(cache_settings, 'SHARED_CACHE', 'default')
+        caches['default'].set('foreign', 'value')
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        clear_users()
+        assert caches['default'].get('foreign') == 'value', (
+            'Проверьте, что сброс кэша пользователей не очищает '
+            'весь общий кэш'
+        )
+        get_user_model().objects.filter(pk=admin.pk).update(role='user')
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 403
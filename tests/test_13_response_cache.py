@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_response_version
+from composition.models import Genres
+
+
+class Test13ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_list_and_invalidation(self, client):
+        Genres.objects.create(name='Ужасы', slug='horror')
+        first = client.get('/api/v1/genres/')
+        assert first.status_code == 200 and first.get('ETag'), (
+            'Проверьте, что GET запрос `/api/v1/genres/` возвращает `ETag`'
+        )
+        with CaptureQueriesContext(connection) as context:
+            second = client.get('/api/v1/genres/')
+        assert second.content == first.content
+        assert not context.captured_queries, (
+            'Проверьте, что повторный GET запрос `/api/v1/genres/` '
+            'отдаётся из кэша без запросов к БД'
+        )
+
+        Genres.objects.create(name='Драма', slug='drama')
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что кэш сбрасывается при изменении жанров'
+        )
+        assert response['ETag'] != first['ETag']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_if_none_match(self, client):
+        Genres.objects.create(name='Комедия', slug='comedy')
+        etag = client.get('/api/v1/genres/?search=com')['ETag']
+        response = client.get(
+            '/api/v1/genres/?search=com', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается 304'
+        )
+        assert not response.content
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidate_after_commit(self, client):
+        version = get_response_version('genres')
+        with transaction.atomic():
+            Genres.objects.create(name='Драма', slug='drama')
+            assert get_response_version('genres') == version, (
+                'Проверьте, что кэш ответов сбрасывается только после '
+                'фиксации транзакции'
+            )
+        assert get_response_version('genres') > version
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_key_includes_host(self, client, settings):
+        settings.ALLOWED_HOSTS = ['one.test', 'two.test']
+        for index in range(12):
+            Genres.objects.create(name=f'Жанр {index}', slug=f'g{index}')
+        first = client.get('/api/v1/genres/', HTTP_HOST='one.test').json()
+        second = client.get('/api/v1/genres/', HTTP_HOST='two.test').json()
+        assert first['next'].startswith('http://one.test/')
+        assert second['next'].startswith('http://two.test/'), (
+            'Проверьте, что ключ кэша ответов учитывает хост'
+        )
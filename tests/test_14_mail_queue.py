@@ -0,0 +1,98 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connections
+
+from reviews.mail import enqueue_mail, executor, send_in_worker
+from reviews.models import MailQueue
+
+
+class Test14MailQueue:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_mail(self, client, settings):
+        settings.MAIL_QUEUE = dict(
+            settings.MAIL_QUEUE, EAGER=False, USE_THREAD=False
+        )
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что письмо не отправляется во время запроса'
+        )
+        assert MailQueue.objects.filter(
+            recipient=data['email'], sent_at__isnull=True
+        ).exists(), 'Проверьте, что письмо с кодом ставится в очередь'
+
+        call_command('send_queued_mail', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert data['email'] in mail.outbox[-1].to
+        assert not MailQueue.objects.filter(sent_at__isnull=True).exists(), (
+            'Проверьте, что `send_queued_mail` отмечает письма отправленными'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_mail_is_retried(self, settings):
+        settings.MAIL_QUEUE = dict(
+            settings.MAIL_QUEUE, EAGER=False, USE_THREAD=False
+        )
+        enqueue_mail('Тема', 'Текст', 'admin@email.com', ['a@yamdb.fake'])
+        settings.EMAIL_BACKEND = 'tests.test_14_mail_queue.FailingBackend'
+        call_command('send_queued_mail', stdout=StringIO())
+        item = MailQueue.objects.get()
+        assert item.sent_at is None and item.attempts == 1, (
+            'Проверьте, что письмо с ошибкой отправки остаётся в очереди'
+        )
+        assert 'недоступен' in item.last_error
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_connection_failure(self, settings):
+        settings.MAIL_QUEUE = dict(
+            settings.MAIL_QUEUE, EAGER=False, USE_THREAD=False
+        )
+        enqueue_mail(
+            'Тема', 'Текст', 'admin@email.com',
+            ['a@yamdb.fake', 'b@yamdb.fake']
+        )
+        settings.EMAIL_BACKEND = 'tests.test_14_mail_queue.UnreachableBackend'
+        call_command('send_queued_mail', stdout=StringIO())
+        assert list(
+            MailQueue.objects.values_list('attempts', 'last_error')
+        ) == [(1, 'SMTP недоступен')] * 2, (
+            'Проверьте, что ошибка соединения засчитывается попыткой '
+            'каждому письму пачки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_worker_closes_connections(self, settings, monkeypatch):
+        settings.MAIL_QUEUE = dict(
+            settings.MAIL_QUEUE, EAGER=False, USE_THREAD=False
+        )
+        enqueue_mail('Тема', 'Текст', 'admin@email.com', ['a@yamdb.fake'])
+        # Тестовая SQLite в памяти не закрывается, проверяем сам вызов.
+        closed = []
+        monkeypatch.setattr(
+            connections, 'close_all', lambda: closed.append(True)
+        )
+        executor.submit(send_in_worker).result()
+        assert closed, (
+            'Проверьте, что поток очереди закрывает соединения с БД'
+        )
+        assert MailQueue.objects.get().sent_at is not None
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('Сервер недоступен')
+
+
+class UnreachableBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP недоступен')
+
+    def send_messages(self, messages):
+        raise AssertionError('Соединение не открыто')
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+
+from api.filters import TitlesFilter
+from composition.models import Categories, Genres, Titles
+
+from .common import create_title
+
+
+class Test15TitleFilters:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_filterset(self, client):
+        films = Categories.objects.create(name='Фильм', slug='films')
+        books = Categories.objects.create(name='Книги', slug='books')
+        horror = Genres.objects.create(name='Ужасы', slug='horror')
+        drama = Genres.objects.create(name='Драма', slug='drama')
+        create_title('Поворот туда', 1990, films, [horror, drama])
+        create_title('Проект', 2005, books, [drama])
+        create_title('Новый поворот', 2020, films, [horror])
+
+        cases = (
+            ('genre=drama', 2),
+            ('genre=horror&category=films', 2),
+            ('category=books', 1),
+            ('name=оворот', 2),
+            ('name_start=Поворот', 1),
+            ('year_min=2000', 2),
+            ('year_min=2000&year_max=2010', 1),
+            ('year=1990', 1),
+        )
+        for query, expected in cases:
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.status_code == 200
+            assert response.json()['count'] == expected, (
+                f'Проверьте фильтрацию `/api/v1/titles/?{query}`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_name_start_uses_index(self):
+        create_title('Поворот туда', 1990, None, [])
+        queryset = TitlesFilter(
+            {'name_start': 'Пово'}, queryset=Titles.objects.order_by('id')
+        ).qs
+        assert list(queryset.values_list('name', flat=True)) == [
+            'Поворот туда'
+        ]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'titles_name' in plan, (
+            'Проверьте, что фильтр `name_start` использует индекс по name: '
+            f'{plan}'
+        )
@@ -0,0 +1,115 @@
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from composition.models import Titles
+from reviews import search
+from reviews.models import Comment, Reviews
+from reviews.signals import search_index_reset
+
+
+class Test16Search:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_titles_reviews_comments(self, client, admin):
+        title = Titles.objects.create(
+            name='Побег из Шоушенка', year=1994, description='Тюремная драма'
+        )
+        other = Titles.objects.create(name='Крестный отец', year=1972)
+        review = Reviews.objects.create(
+            title=other, author=admin, text='Сильнее, чем Шоушенк', score=9
+        )
+        Comment.objects.create(
+            review=review, author=admin, text='Про тюрьму и надежду'
+        )
+
+        response = client.get('/api/v1/search/?q=шоушенк')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/search/` возвращает статус 200'
+        )
+        results = response.json()['results']
+        assert [(item['type'], item['id']) for item in results] == [
+            ('titles', title.id), ('reviews', review.id)
+        ], 'Проверьте, что совпадение в названии ранжируется выше'
+        assert '<b>' in results[0]['snippet']
+
+        response = client.get('/api/v1/search/?q=тюр&type=comments')
+        results = response.json()['results']
+        assert len(results) == 1 and results[0]['title_id'] == other.id, (
+            'Проверьте фильтрацию поиска по параметру `type`'
+        )
+
+        title.delete()
+        review.text = 'Просто классика'
+        review.save()
+        response = client.get('/api/v1/search/?q=шоушенк')
+        assert response.json()['results'] == [], (
+            'Проверьте, что индекс обновляется при изменении и удалении'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_validation(self, client):
+        assert client.get('/api/v1/search/').status_code == 400
+        response = client.get('/api/v1/search/?q="AND OR (')
+        assert response.status_code == 200 and response.json()['results'] == [], (
+            'Проверьте, что спецсимволы в запросе не ломают поиск'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_snippet_escaped(self, client, admin):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        Reviews.objects.create(
+            title=title, author=admin, score=5,
+            text='Шедевр <img src=x onerror=alert(1)> <b>жирный</b>'
+        )
+        results = client.get('/api/v1/search/?q=шедевр').json()['results']
+        assert results[0]['snippet'] == (
+            '<b>Шедевр</b> &lt;img src=x onerror=alert(1)&gt; '
+            '&lt;b&gt;жирный&lt;/b&gt;'
+        ), 'Проверьте, что текст во фрагменте экранируется'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_comment_without_review_query(self, admin):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        review = Reviews.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        comment = Comment(review_id=review.id, author=admin, text='Коммент')
+        with CaptureQueriesContext(connection) as context:
+            comment.save()
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ], 'Проверьте, что индексация комментария не загружает отзыв'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_import_csv_indexes(self, client):
+        call_command('import_csv', stdout=StringIO())
+        title = Titles.objects.get(pk=1)
+        response = client.get('/api/v1/search/', {'q': title.name})
+        assert title.id in [
+            item['id'] for item in response.json()['results']
+            if item['type'] == 'titles'
+        ], 'Проверьте, что `import_csv` перестраивает поисковый индекс'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_migrate_clears_only_stale_index(self):
+        reviews_app = apps.get_app_config('reviews')
+        search.index_document('titles', 100, 'Старое', '', 100)
+        search_index_reset(sender=reviews_app)
+        assert not search.search('Старое'), (
+            'Проверьте, что после flush индекс очищается'
+        )
+        Titles.objects.create(name='Поворот туда', year=2000)
+        search.index_document('titles', 100, 'Старое', '', 100)
+        with CaptureQueriesContext(connection) as context:
+            search_index_reset(sender=reviews_app)
+        assert not [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT')
+        ], 'Проверьте, что migrate не перестраивает индекс целиком'
+        assert search.search('Старое')
@@ -0,0 +1,33 @@
+import pytest
+
+from composition.models import Genres
+
+
+class Test17Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics_endpoint(self, client, admin_client, user_client):
+        Genres.objects.create(name='Ужасы', slug='horror')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/genres/')
+
+        assert client.get('/api/v1/metrics/').status_code == 401
+        assert user_client.get('/api/v1/metrics/').status_code == 403, (
+            'Проверьте, что метрики доступны только администратору'
+        )
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        for line in (
+            'api_requests_total{route="api:titles-list",method="GET",'
+            'status="200"}',
+            'api_db_queries_bucket{route="api:titles-list",method="GET",',
+            'api_request_duration_seconds_count{route="api:genres-list",'
+            'method="GET"}',
+            'api_serializer_duration_seconds_sum{route="api:genres-list",',
+            'api_response_size_bytes_sum{route="api:genres-list",',
+        ):
+            assert line in body, (
+                f'Проверьте, что метрики содержат `{line}`'
+            )
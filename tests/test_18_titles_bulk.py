@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from composition.models import Categories, Genres, GenreTitle, Titles
+from reviews import changes, search
+
+
+class Test18TitlesBulk:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_create(self, admin_client, user_client):
+        Categories.objects.create(name='Фильм', slug='films')
+        Genres.objects.create(name='Ужасы', slug='horror')
+        Genres.objects.create(name='Драма', slug='drama')
+        Titles.objects.create(
+            name='Проект', year=2020,
+            category=Categories.objects.get(slug='films')
+        )
+        items = [
+            {'name': f'Фильм {i}', 'year': 2000, 'category': 'films',
+             'genre': ['horror', 'drama']}
+            for i in range(20)
+        ]
+        items += [
+            {'name': 'Без категории', 'year': 2000, 'category': 'nope'},
+            {'name': 'Проект', 'year': 2020, 'category': 'films'},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'films'},
+            {'name': 'Фильм 0', 'year': 2000, 'category': 'films',
+             'genre': ['unknown']},
+        ]
+        url = '/api/v1/titles/bulk/'
+        assert user_client.post(url, data=items, format='json'
+                                ).status_code == 403
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(url, data=items, format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что при частичной ошибке возвращается статус 207'
+        )
+        data = response.json()
+        assert data['created'] == 20
+        errors = [item for item in data['results'] if 'errors' in item]
+        assert [item['index'] for item in errors] == [20, 21, 22, 23], (
+            'Проверьте, что ошибки возвращаются по каждому элементу'
+        )
+        assert 'category' in errors[0]['errors']
+        assert 'year' in errors[2]['errors']
+        created = [item['id'] for item in data['results'] if 'id' in item]
+        assert sorted(
+            Titles.objects.filter(name__startswith='Фильм')
+            .values_list('id', flat=True)
+        ) == sorted(created)
+        assert GenreTitle.objects.filter(title_id__in=created).count() == 40
+        assert Titles.objects.get(pk=created[3]).name == 'Фильм 3', (
+            'Проверьте, что id в ответе соответствуют элементам запроса'
+        )
+        assert len(context.captured_queries) < 20, (
+            'Проверьте, что ссылки разрешаются пачкой, а не по одной'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_requires_list(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data={'name': 'x'}, format='json'
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_ids_after_deleted_titles(self, admin_client):
+        category = Categories.objects.create(name='Фильм', slug='films')
+        drama = Genres.objects.create(name='Драма', slug='drama')
+        for index in range(3):
+            Titles.objects.create(name=f'Старый {index}', year=2000)
+        # Удалённый последний id не переиспользуется: id пачки не
+        # вычисляются от текущего максимума.
+        Titles.objects.order_by('-id').first().delete()
+        items = [
+            {'name': f'Новый {i}', 'year': 2000, 'category': 'films',
+             'genre': ['drama'] if i % 2 else []}
+            for i in range(5)
+        ]
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data=items, format='json'
+        )
+        assert response.status_code == 201
+        for item in response.json()['results']:
+            title = Titles.objects.get(pk=item['id'])
+            assert title.name == f'Новый {item["index"]}'
+            assert title.category == category
+            assert list(title.genre.all()) == (
+                [drama] if item['index'] % 2 else []
+            ), 'Проверьте, что жанры привязаны к своим произведениям'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_index_and_log_in_transaction(self, admin_client, monkeypatch):
+        Categories.objects.create(name='Фильм', slug='films')
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('Журнал недоступен')
+
+        monkeypatch.setattr(changes, 'record', fail)
+        items = [{'name': 'Новый', 'year': 2000, 'category': 'films'}]
+        with pytest.raises(RuntimeError):
+            admin_client.post(
+                '/api/v1/titles/bulk/', data=items, format='json'
+            )
+        assert not Titles.objects.exists(), (
+            'Проверьте, что журнал изменений пишется в транзакции пачки'
+        )
+        assert not search.search('Новый'), (
+            'Проверьте, что индекс пишется в транзакции пачки'
+        )
@@ -0,0 +1,73 @@
+import pytest
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import replicas
+from api.replicas import ReplicaMiddleware, ReplicaRouter
+from api.views import GenresViewSet, SignUp
+from composition.models import Genres
+
+
+class Test19Replicas:
+
+    def run(self, request, view):
+        seen = {}
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            seen['db'] = ReplicaRouter().db_for_read(Genres)
+            # Реплик в тестовой БД нет: сам запрос выполняем на основной.
+            replicas._local.alias = None
+            return view(request)
+
+        middleware = ReplicaMiddleware(get_response)
+        response = middleware(request)
+        return seen['db'], response
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reads_routed_and_sticky(self, settings, admin):
+        settings.READ_REPLICAS = dict(
+            settings.READ_REPLICAS, ALIASES=['replica1', 'replica2']
+        )
+        factory = RequestFactory()
+        auth = f'Bearer {AccessToken.for_user(admin)}'
+        genres = GenresViewSet.as_view({'get': 'list', 'post': 'create'})
+
+        used = set()
+        for _ in range(2):
+            db, _ = self.run(
+                factory.get('/api/v1/genres/', HTTP_AUTHORIZATION=auth),
+                genres
+            )
+            used.add(db)
+        assert used == {'replica1', 'replica2'}, (
+            'Проверьте, что чтение распределяется по репликам по кругу'
+        )
+
+        db, response = self.run(
+            factory.post('/api/v1/genres/', {'name': 'Ужасы', 'slug': 'h'},
+                         HTTP_AUTHORIZATION=auth),
+            genres
+        )
+        assert response.status_code == 201 and db is None, (
+            'Проверьте, что запись идёт в основную БД'
+        )
+        db, _ = self.run(
+            factory.get('/api/v1/genres/', HTTP_AUTHORIZATION=auth), genres
+        )
+        assert db is None, (
+            'Проверьте, что после записи клиент читает с основной БД'
+        )
+        db, _ = self.run(factory.get('/api/v1/genres/'), genres)
+        assert db in ('replica1', 'replica2'), (
+            'Проверьте, что окно после записи действует только на автора'
+        )
+
+    def test_02_no_replicas_configured(self, settings):
+        settings.READ_REPLICAS = dict(settings.READ_REPLICAS, ALIASES=[])
+        request = RequestFactory().get('/api/v1/auth/signup/')
+        view = SignUp.as_view({'get': 'list'})
+        ReplicaMiddleware(lambda request: None).process_view(
+            request, view, (), {}
+        )
+        assert ReplicaRouter().db_for_read(Genres) is None
@@ -0,0 +1,28 @@
+import pytest
+from django.db import connection
+
+
+class Test20Sqlite:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert synchronous == 1 and busy_timeout == 5000, (
+            'Проверьте, что к соединению SQLite применяются `SQLITE_PRAGMAS`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_health(self, client, admin_client):
+        response = client.get('/api/v1/health/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/health/` возвращает статус 200'
+        )
+        assert response.json() == {'status': 'ok'}, (
+            'Проверьте, что анонимный запрос не видит подробностей о БД'
+        )
+        data = admin_client.get('/api/v1/health/').json()
+        assert data['status'] == 'ok' and data['databases']['default']['ok']
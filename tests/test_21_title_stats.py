@@ -0,0 +1,87 @@
+import pytest
+from django.core.management import call_command
+
+from composition.models import Titles, TitleStats
+from reviews.models import Reviews
+
+
+def histogram(**scores):
+    result = {str(score): 0 for score in range(1, 11)}
+    result.update(scores)
+    return result
+
+
+class Test21TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_follow_reviews(self, admin, user):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        Reviews.objects.create(title=title, author=admin, text='a', score=4)
+        review = Reviews.objects.create(
+            title=title, author=user, text='b', score=8
+        )
+        stats = TitleStats.objects.get(title=title)
+        assert stats.score_histogram == histogram(**{'4': 1, '8': 1}), (
+            'Проверьте, что статистика обновляется при создании отзыва'
+        )
+
+        review = Reviews.objects.get(pk=review.pk)
+        review.score = 4
+        review.save()
+        stats.refresh_from_db()
+        assert stats.score_histogram == histogram(**{'4': 2}), (
+            'Проверьте, что статистика обновляется при изменении оценки'
+        )
+
+        review.delete()
+        stats.refresh_from_db()
+        assert stats.score_histogram == histogram(**{'4': 1}), (
+            'Проверьте, что статистика обновляется при удалении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_command(self, admin, user):
+        title = Titles.objects.create(name='Проект', year=2020)
+        Reviews.objects.create(title=title, author=admin, text='a', score=5)
+        Reviews.objects.create(title=title, author=user, text='b', score=10)
+        TitleStats.objects.all().delete()
+
+        call_command('rebuild_ratings')
+        stats = TitleStats.objects.get(title=title)
+        assert stats.score_histogram == histogram(**{'5': 1, '10': 1}), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'статистику оценок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_expand_stats(
+            self, client, admin, user, django_assert_max_num_queries):
+        title = Titles.objects.create(name='Проект', year=2020)
+        Titles.objects.create(name='Без отзывов', year=2021)
+        Reviews.objects.create(title=title, author=admin, text='a', score=7)
+        Reviews.objects.create(title=title, author=user, text='b', score=7)
+
+        response = client.get('/api/v1/titles/')
+        assert not {'reviews_count', 'score_histogram'} & set(
+            response.json()['results'][0]
+        ), 'Проверьте, что статистика отдаётся только с `?expand=`'
+
+        expand = 'reviews_count,score_histogram'
+        with django_assert_max_num_queries(3):
+            response = client.get(f'/api/v1/titles/?expand={expand}')
+        results = response.json()['results']
+        assert results[0]['reviews_count'] == 2
+        assert results[0]['score_histogram'] == histogram(**{'7': 2}), (
+            'Проверьте, что `?expand=score_histogram` возвращает '
+            'гистограмму оценок'
+        )
+        assert results[1]['reviews_count'] == 0
+        assert results[1]['score_histogram'] == histogram(), (
+            'Проверьте, что у произведения без отзывов статистика нулевая'
+        )
+
+        response = client.get(
+            f'/api/v1/titles/{title.id}/?expand=reviews_count'
+        )
+        assert response.json()['reviews_count'] == 2
+        assert 'score_histogram' not in response.json()
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Reviews
+
+from .common import create_catalogue
+
+
+DESCRIPTION = 'о' * 3000
+
+
+class Test22SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client):
+        create_catalogue(description=DESCRIPTION)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?fields=id,name,year')
+        assert response.status_code == 200
+        assert response.json()['results'][0].keys() == {
+            'id', 'name', 'year'
+        }, 'Проверьте, что `?fields=` оставляет в ответе только эти поля'
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'description' not in sql and 'genre' not in sql, (
+            'Проверьте, что `?fields=` не загружает описание и жанры'
+        )
+
+        response = client.get('/api/v1/titles/?fields=name,category')
+        assert response.json()['results'][0] == {
+            'name': 'Произведение 0',
+            'category': {'slug': 'films', 'name': 'Фильм'},
+        }, 'Проверьте, что вложенные поля выводятся с `?fields=`'
+
+        response = client.get('/api/v1/titles/')
+        assert {'genre', 'description', 'rating'} <= set(
+            response.json()['results'][0]
+        ), 'Проверьте, что без `?fields=` выводятся все поля'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_expand(self, client):
+        [title] = create_catalogue(description=DESCRIPTION)
+        response = client.get(
+            f'/api/v1/titles/{title.id}/?fields=name&expand=score_histogram'
+        )
+        assert response.json() == {
+            'name': 'Произведение 0',
+            'score_histogram': {str(score): 0 for score in range(1, 11)},
+        }, 'Проверьте, что `?expand=` добавляет поле к `?fields=`'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_and_comments_fields(
+            self, client, admin, user, django_assert_max_num_queries):
+        [title] = create_catalogue(description=DESCRIPTION)
+        review = Reviews.objects.create(
+            title=title, author=admin, text='Отзыв', score=7
+        )
+        Reviews.objects.create(title=title, author=user, text='Ещё', score=3)
+        Comment.objects.create(review=review, author=user, text='Согласен')
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.get(url + '?fields=id,score')
+        assert [set(item) for item in response.json()['results']] == [
+            {'id', 'score'}, {'id', 'score'}
+        ], 'Проверьте, что `?fields=` работает для отзывов'
+
+        with django_assert_max_num_queries(2):
+            response = client.get(url + '?fields=author&pagination=cursor')
+        assert sorted(
+            item['author'] for item in response.json()['results']
+        ) == sorted([admin.username, user.username])
+
+        response = client.get(
+            f'{url}{review.id}/comments/?fields=text,author'
+        )
+        assert response.json()['results'] == [
+            {'text': 'Согласен', 'author': user.username}
+        ], 'Проверьте, что `?fields=` работает для комментариев'
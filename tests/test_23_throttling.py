@@ -0,0 +1,97 @@
+import pytest
+
+from api import throttling
+
+
+def throttle_settings(settings, **rates):
+    settings.THROTTLE = dict(
+        settings.THROTTLE, RATES=dict(settings.THROTTLE['RATES'], **rates)
+    )
+
+
+class Test23Throttling:
+
+    def test_01_sliding_window(self):
+        assert throttling.sliding_window(0, 1, 0, 2, 60) == (True, None)
+        allowed, wait = throttling.sliding_window(4, 0, 15, 2, 60)
+        assert not allowed and wait == 15, (
+            'Проверьте, что предыдущее окно учитывается с весом '
+            'непрошедшей доли текущего'
+        )
+        assert throttling.sliding_window(4, 0, 50, 2, 60)[0]
+
+    def test_02_local_store(self):
+        store = throttling.LocalWindowStore()
+        assert store.hit('key', 2, 60)[0] and store.hit('key', 2, 60)[0]
+        allowed, wait = store.hit('key', 2, 60)
+        assert not allowed and 0 < wait <= 60, (
+            'Проверьте, что счётчик запрещает запросы сверх лимита'
+        )
+        assert store.hit('other', 2, 60)[0]
+        store.reset()
+        assert store.hit('key', 2, 60)[0]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cache_store_without_sql(
+            self, settings, django_assert_num_queries):
+        store = throttling.CacheWindowStore()
+        store.reset()
+        with django_assert_num_queries(0):
+            results = [store.hit('key', 3, 60)[0] for _ in range(4)]
+        assert results == [True, True, True, False], (
+            'Проверьте, что счётчики в кэше ограничивают запросы без SQL'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_signup_throttled(self, client, settings):
+        throttle_settings(settings, signup_user='2/hour')
+        url = '/api/v1/auth/signup/'
+        for _ in range(2):
+            response = client.post(
+                url, data={'email': 'one@yamdb.fake', 'username': 'one'}
+            )
+            assert response.status_code != 429
+        response = client.post(
+            url, data={'email': 'ONE@yamdb.fake', 'username': 'other'}
+        )
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация ограничена по адресу почты'
+        )
+        assert 'Retry-After' in response
+        response = client.post(
+            url, data={'email': 'two@yamdb.fake', 'username': 'two'}
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_token_throttled_by_ip(self, client, settings):
+        throttle_settings(settings, token_ip='3/minute')
+        url = '/api/v1/auth/token/'
+        statuses = [
+            client.post(url, data={
+                'username': f'user{index}', 'confirmation_code': 'x'
+            }).status_code
+            for index in range(4)
+        ]
+        assert 429 not in statuses[:3] and statuses[3] == 429, (
+            'Проверьте, что получение токена ограничено по IP'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_denied_request_keeps_other_limits(self, client, settings):
+        throttle_settings(settings, token_ip='3/minute', token_user='1/minute')
+        url = '/api/v1/auth/token/'
+        statuses = [
+            client.post(url, data={
+                'username': username, 'confirmation_code': 'x'
+            }).status_code
+            for username in ('a', 'a', 'b', 'c')
+        ]
+        assert statuses[1] == 429 and 429 not in statuses[2:], (
+            'Проверьте, что отказ по имени пользователя не расходует '
+            'лимит по IP'
+        )
+
+    def test_07_get_idents_required(self):
+        with pytest.raises(TypeError):
+            throttling.WindowRateThrottle()
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Comment
+
+from .common import add_review, create_catalogue, create_title
+
+
+@pytest.fixture
+def catalogue(admin):
+    [first] = create_catalogue()
+    second = create_title('Второе', 2001)
+    add_review(first, admin, score=8, comments=['Коммент'])
+    return first, second
+
+
+def read_ndjson(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class Test24Export:
+    url = '/api/v1/export/titles/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_permissions(self, client, user_client):
+        assert client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ndjson(self, admin_client, admin, catalogue):
+        first, second = catalogue
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        titles = read_ndjson(response)
+        assert [title['id'] for title in titles] == [first.id, second.id]
+        assert titles[0]['category'] == {'slug': 'films', 'name': 'Фильм'}
+        assert titles[0]['genres'] == ['drama']
+        assert titles[0]['rating'] == 8
+        assert 'reviews' not in titles[0]
+
+        response = admin_client.get(self.url + '?include=comments')
+        review = read_ndjson(response)[0]['reviews'][0]
+        assert review['author'] == admin.username and review['score'] == 8
+        assert [comment['text'] for comment in review['comments']] == [
+            'Коммент'
+        ], 'Проверьте, что `include=comments` выгружает комментарии'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_updated_since(self, admin_client, admin, catalogue):
+        first, second = catalogue
+        since = timezone.now()
+        response = admin_client.get(
+            self.url, {'updated_since': since.isoformat()}
+        )
+        assert read_ndjson(response) == []
+        Comment.objects.create(
+            review=first.reviews.get(), author=admin, text='Ещё'
+        )
+        response = admin_client.get(
+            self.url, {'updated_since': since.isoformat()}
+        )
+        assert [title['id'] for title in read_ndjson(response)] == [
+            first.id
+        ], (
+            'Проверьте, что новый комментарий отмечает произведение '
+            'изменённым для `updated_since`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_csv_command(self, catalogue):
+        first, second = catalogue
+        out = io.StringIO()
+        call_command(
+            'export_titles', '--format', 'csv', '--include', 'reviews',
+            '--chunk-size', '1', stdout=out
+        )
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert [row['id'] for row in rows] == [str(first.id), str(second.id)]
+        assert rows[0]['genres'] == 'drama'
+        assert rows[0]['review_score'] == '8' and rows[1]['review_id'] == ''
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('change', [
+        'rename_category', 'delete_category', 'rename_genre', 'delete_genre'
+    ])
+    def test_05_catalogue_changes_update_titles(
+            self, admin_client, catalogue, change):
+        first, second = catalogue
+        since = timezone.now()
+        action, model = change.split('_')
+        instance = (first.category if model == 'category'
+                    else first.genre.get())
+        if action == 'rename':
+            instance.slug = f'{instance.slug}-new'
+            instance.save()
+        else:
+            instance.delete()
+        response = admin_client.get(
+            self.url, {'updated_since': since.isoformat()}
+        )
+        assert [title['id'] for title in read_ndjson(response)] == [
+            first.id
+        ], (
+            'Проверьте, что изменение категории или жанра отмечает '
+            'произведения изменёнными для `updated_since`'
+        )
@@ -0,0 +1,104 @@
+import pytest
+
+from composition.models import Categories, Genres, Titles
+from reviews.models import ChangeLog, Reviews
+
+
+class Test25Changes:
+    url = '/api/v1/changes/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_permissions(self, client, user_client):
+        assert client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403, (
+            'Проверьте, что журнал изменений доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_changes_feed(self, admin_client, admin):
+        since = admin_client.get(self.url).json()['next_since']
+        category = Categories.objects.create(name='Фильм', slug='films')
+        genre = Genres.objects.create(name='Драма', slug='drama')
+        title = Titles.objects.create(
+            name='Поворот туда', year=2000, category=category
+        )
+        title.genre.add(genre)
+        review = Reviews.objects.create(
+            title=title, author=admin, text='Отзыв', score=8
+        )
+        review.delete()
+
+        response = admin_client.get(self.url, {'since': since})
+        assert response.status_code == 200
+        data = response.json()
+        seqs = [change['seq'] for change in data['results']]
+        assert seqs == sorted(seqs) and seqs[0] > since, (
+            'Проверьте, что номера изменений монотонно растут'
+        )
+        assert data['next_since'] == seqs[-1] and not data['has_more']
+        actions = [
+            (change['kind'], change['action']) for change in data['results']
+        ]
+        assert ('reviews', 'upsert') in actions
+        assert actions[-2:] == [('reviews', 'delete'), ('titles', 'upsert')]
+        assert data['results'][-1]['data'] == {
+            'id': title.id, 'name': 'Поворот туда', 'year': 2000,
+            'description': None, 'category': 'films', 'rating': None,
+            'genres': ['drama'],
+        }, 'Проверьте, что изменение отдаёт текущее состояние объекта'
+        assert data['results'][-2]['data'] is None
+
+        response = admin_client.get(
+            self.url, {'since': since, 'limit': 2, 'kind': 'genres'}
+        )
+        data = response.json()
+        assert [change['id'] for change in data['results']] == [genre.id]
+        assert not data['has_more']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batches(
+            self, admin_client, django_assert_max_num_queries):
+        since = ChangeLog.objects.order_by('-id').values_list(
+            'id', flat=True).first() or 0
+        for index in range(5):
+            Genres.objects.create(name=f'Жанр {index}', slug=f'genre{index}')
+        seen = []
+        while True:
+            with django_assert_max_num_queries(4):
+                data = admin_client.get(
+                    self.url, {'since': since, 'limit': 2}
+                ).json()
+            seen += [change['data']['slug'] for change in data['results']]
+            since = data['next_since']
+            if not data['has_more']:
+                break
+        assert seen == [f'genre{index}' for index in range(5)], (
+            'Проверьте, что журнал читается пачками по `since`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_title_creates_genres(self, client, admin_client):
+        Categories.objects.create(name='Фильм', slug='films')
+        assert client.get('/api/v1/genres/').json()['results'] == []
+        since = admin_client.get(self.url).json()['next_since']
+        data = {
+            'name': 'Поворот туда', 'year': 2000, 'category': 'films',
+            'genres': [{'name': 'Драма', 'slug': 'drama'}],
+        }
+        response = admin_client.post(
+            '/api/v1/titles/', data=data, format='json'
+        )
+        assert response.status_code == 201
+        response = client.get('/api/v1/genres/')
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'drama'
+        ], 'Проверьте, что новый жанр произведения сбрасывает кэш жанров'
+        response = admin_client.get(
+            self.url, {'since': since, 'kind': 'genres'}
+        )
+        assert [
+            (change['data']['slug'], change['action'])
+            for change in response.json()['results']
+        ] == [('drama', 'upsert')], (
+            'Проверьте, что новый жанр произведения попадает в журнал'
+        )
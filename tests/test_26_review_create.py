@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from composition.models import Titles
+from reviews.models import Reviews
+
+
+def selects(context, table, condition=''):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        and condition in query['sql'].partition('WHERE')[2]
+    ]
+
+
+class Test26ReviewCreate:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_single_title_lookup(self, user_client, user):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'a', 'score': 7})
+        assert response.status_code == 201, (
+            'Проверьте, что аутентифицированный пользователь может '
+            'оставить отзыв'
+        )
+        assert response.json()['title'] == title.id
+        assert response.json()['author'] == user.username
+        assert len(selects(context, 'composition_titles')) == 1, (
+            'Проверьте, что при создании отзыва произведение '
+            'запрашивается один раз'
+        )
+        assert not selects(context, 'reviews_reviews', 'author_id'), (
+            'Проверьте, что повторный отзыв отсекает ограничение БД, '
+            'а не отдельный запрос'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_duplicate_is_bad_request(self, user_client, user):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'a', 'score': 7})
+        response = user_client.post(url, data={'text': 'b', 'score': 3})
+        assert response.status_code == 400, (
+            'Проверьте, что второй отзыв на произведение возвращает 400'
+        )
+        assert Reviews.objects.filter(title=title).count() == 1
+        title.refresh_from_db()
+        assert title.rating == 7, (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
+        response = user_client.post(
+            '/api/v1/titles/0/reviews/', data={'text': 'a', 'score': 7}
+        )
+        assert response.status_code == 404
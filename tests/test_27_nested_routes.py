@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment
+
+from .common import add_review, create_title
+
+
+@pytest.fixture
+def discussion(admin):
+    title = create_title()
+    other = create_title('Поворот обратно', 2001)
+    review = add_review(title, admin, comments=['Коммент'])
+    return title, other, review
+
+
+class Test27NestedRoutes:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_single_query_listing(self, client, discussion):
+        title, other, review = discussion
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert [item['text'] for item in response.json()['results']] == [
+            'Коммент'
+        ]
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "reviews_reviews" WHERE' in query['sql']
+        ], 'Проверьте, что список комментариев не запрашивает отзыв отдельно'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == 1
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "composition_titles"' in query['sql']
+        ], 'Проверьте, что список отзывов не запрашивает произведение'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_chain_is_validated(self, client, user_client, discussion):
+        title, other, review = discussion
+        wrong = f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        assert client.get(wrong).status_code == 404, (
+            'Проверьте, что отзыв чужого произведения возвращает 404'
+        )
+        response = user_client.post(wrong, data={'text': 'Ещё'})
+        assert response.status_code == 404
+        comment = review.comments.get()
+        assert client.get(f'{wrong}{comment.id}/').status_code == 404
+        assert client.get('/api/v1/titles/0/reviews/').status_code == 404
+        assert client.get(
+            f'/api/v1/titles/{other.id}/reviews/'
+        ).status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_create_resolves_parent_once(self, user_client, discussion):
+        title, other, review = discussion
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Согласен'})
+        assert response.status_code == 201
+        assert len([
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_reviews" WHERE' in query['sql']
+        ]) == 1, 'Проверьте, что отзыв запрашивается один раз'
+        assert Comment.objects.filter(
+            review=review, text='Согласен'
+        ).exists()
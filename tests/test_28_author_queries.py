@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from composition.models import Titles
+from reviews.models import Comment, Reviews, User
+
+
+class Test28AuthorQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('authors', [1, 10])
+    def test_01_constant_queries_per_page(
+            self, client, authors, django_assert_num_queries):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        User.objects.bulk_create(
+            User(username=f'author{index}', email=f'a{index}@yamdb.fake')
+            for index in range(authors)
+        )
+        users = list(User.objects.filter(username__startswith='author'))
+        for user in users:
+            review = Reviews.objects.create(
+                title=title, author=user, text='Отзыв', score=5
+            )
+            for commenter in users:
+                Comment.objects.create(
+                    review=review, author=commenter, text='Коммент'
+                )
+        # COUNT и страница с авторами - независимо от числа авторов.
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        results = response.json()['results']
+        assert len(results) == authors
+        assert {item['author'] for item in results} == {
+            user.username for user in users
+        }
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert len(response.json()['results']) == authors
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_only_username_loaded(self, client, admin):
+        title = Titles.objects.create(name='Поворот туда', year=2000)
+        Reviews.objects.create(title=title, author=admin, text='a', score=5)
+        with CaptureQueriesContext(connection) as context:
+            client.get(f'/api/v1/titles/{title.id}/reviews/')
+        sql = context.captured_queries[-1]['sql']
+        assert '"reviews_user"."username"' in sql
+        assert '"reviews_user"."password"' not in sql, (
+            'Проверьте, что из таблицы пользователей читается только username'
+        )
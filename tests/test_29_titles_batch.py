@@ -0,0 +1,56 @@
+import pytest
+
+from .common import create_catalogue
+
+
+class Test29TitlesBatch:
+    url = '/api/v1/titles/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_request_order(self, client, django_assert_num_queries):
+        titles = create_catalogue(5)
+        ids = [titles[3].id, titles[0].id, 0, titles[4].id, titles[0].id]
+        with django_assert_num_queries(2):
+            response = client.get(
+                self.url, {'ids': ','.join(map(str, ids))}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [
+            titles[3].id, titles[0].id, titles[4].id
+        ], 'Проверьте, что произведения возвращаются в порядке запроса'
+        assert data['missing'] == [0]
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'}
+        ]
+        assert data['results'][0]['category']['slug'] == 'films'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_validation(self, client, settings):
+        titles = create_catalogue(3)
+        assert client.get(self.url, {'ids': '1,a'}).status_code == 400
+        assert client.get(self.url, {'ids': ''}).status_code == 400
+        response = client.get(self.url, {'ids': '1,99999999999999999999'})
+        assert response.status_code == 400, (
+            'Проверьте, что id вне 64-битного диапазона дают 400'
+        )
+        settings.TITLES_BATCH_MAX_SIZE = 2
+        response = client.get(
+            self.url, {'ids': ','.join(str(title.id) for title in titles)}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что размер пакета ограничен '
+            '`TITLES_BATCH_MAX_SIZE`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_with_fields(self, client):
+        titles = create_catalogue(2)
+        response = client.get(
+            self.url, {'ids': f'{titles[1].id},{titles[0].id}',
+                       'fields': 'id,name'}
+        )
+        assert response.json()['results'] == [
+            {'id': titles[1].id, 'name': 'Произведение 1'},
+            {'id': titles[0].id, 'name': 'Произведение 0'},
+        ]
@@ -0,0 +1,41 @@
+import pytest
+
+from composition.models import Genres, Titles
+
+msgpack = pytest.importorskip('msgpack')
+
+
+class Test30MessagePack:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_render(self, client):
+        Titles.objects.create(name='Поворот туда', year=2000)
+        expected = client.get('/api/v1/titles/').json()
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT='application/msgpack'
+        )
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/msgpack', (
+            'Проверьте, что API отдаёт MessagePack по заголовку Accept'
+        )
+        assert msgpack.unpackb(response.content, raw=False) == expected
+        response = client.get('/api/v1/titles/?format=msgpack')
+        assert msgpack.unpackb(response.content, raw=False) == expected
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_parse(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=msgpack.packb({'name': 'Драма', 'slug': 'drama'}),
+            content_type='application/msgpack'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает тело запроса в MessagePack'
+        )
+        assert Genres.objects.filter(slug='drama').exists()
+        response = admin_client.post(
+            '/api/v1/genres/',
+            data=b'\xc1',
+            content_type='application/msgpack'
+        )
+        assert response.status_code == 400
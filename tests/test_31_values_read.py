@@ -0,0 +1,97 @@
+import pytest
+
+from api.cache import invalidate_responses
+from api.mixins import ValuesReadMixin
+from api.paginator import FeedPagination
+from api.serializers import ReviewsSerializer, TitlesViewSerializer
+from api.values import get_plan
+from reviews.models import User
+
+from .common import add_review, create_catalogue, create_title
+
+
+@pytest.fixture
+def title():
+    [title] = create_catalogue(genres=2, description='Описание')
+    create_title('Без категории', 2001)
+    for index, score in enumerate((7, 8, 10)):
+        author = User.objects.create(
+            username=f'author{index}', email=f'a{index}@yamdb.fake'
+        )
+        add_review(title, author, f'Отзыв {index}', score)
+    return title
+
+
+def both_paths(client, monkeypatch, url, **params):
+    """Ответ по плану .values() и ответ через ModelSerializer."""
+    fast = client.get(url, params)
+    with monkeypatch.context() as patch:
+        patch.setattr(ValuesReadMixin, 'get_values_plan', lambda self: None)
+        invalidate_responses('titles')
+        slow = client.get(url, params)
+    assert fast.status_code == slow.status_code == 200
+    return fast, slow
+
+
+class Test31ValuesRead:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('format', ['json', 'msgpack'])
+    def test_01_titles_same_bytes(self, client, monkeypatch, format,
+                                  title):
+        if format == 'msgpack':
+            pytest.importorskip('msgpack')
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{title.id}/'):
+            fast, slow = both_paths(client, monkeypatch, url, format=format)
+            assert fast.content == slow.content, (
+                'Проверьте, что быстрый путь отдаёт те же байты, '
+                'что и сериализатор'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_same_bytes(self, client, monkeypatch, title):
+        review = title.reviews.first()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        for params in ({}, {'pagination': 'cursor'}):
+            fast, slow = both_paths(client, monkeypatch, url, **params)
+            assert fast.content == slow.content
+        fast, slow = both_paths(client, monkeypatch, f'{url}{review.id}/')
+        assert fast.content == slow.content
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cursor_next_link(self, client, monkeypatch, title):
+        monkeypatch.setattr(FeedPagination, 'page_size', 2)
+        # Курсор строится из строки .values(), а не объекта модели.
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/', {'pagination': 'cursor'}
+        ).json()
+        ids = [item['id'] for item in response['results']]
+        response = client.get(response['next']).json()
+        ids += [item['id'] for item in response['results']]
+        assert response['next'] is None
+        assert ids == list(
+            title.reviews.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+
+    def test_04_plans_compiled(self):
+        assert get_plan(TitlesViewSerializer) is not None, (
+            'Проверьте, что для TitlesViewSerializer собирается план'
+        )
+        assert get_plan(ReviewsSerializer) is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_queries(self, client, django_assert_num_queries, title):
+        # COUNT, страница с категорией и жанры страницы.
+        with django_assert_num_queries(3):
+            client.get('/api/v1/titles/')
+        with django_assert_num_queries(2):
+            client.get(f'/api/v1/titles/{title.id}/reviews/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_missing(self, client, title):
+        assert client.get('/api/v1/titles/0/').status_code == 404
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/0/')
+        assert response.status_code == 404
+        assert client.get('/api/v1/titles/0/reviews/').status_code == 404